@@ -9,11 +9,13 @@ and identify missing files for restoration.
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from tqdm import tqdm
 
 from photo_restore.comparison import PhotoComparator, LivePhotoHandler
+from photo_restore.core import open_hash_cache
 from photo_restore.output import Reporter
 from photo_restore.readers import AmazonReader, ICloudReader
 
@@ -75,6 +77,11 @@ Examples:
         default=5,
         help="Hamming distance threshold for perceptual matching (default: 5)",
     )
+    parser.add_argument(
+        "--no-hash-cache",
+        action="store_true",
+        help="Hash every file instead of reusing hashes cached by earlier runs",
+    )
 
     return parser.parse_args()
 
@@ -110,34 +117,29 @@ def main() -> int:
 
     # Initialize components
     reporter = Reporter(args.output, dry_run=args.dry_run, verbose=args.verbose)
+    hash_cache = None if args.no_hash_cache else open_hash_cache()
 
     try:
         cpu_count = os.cpu_count() or 4
 
-        # Load Amazon photos
-        print("Loading Amazon Photos...")
-        amazon_reader = AmazonReader(args.amazon_folder, verbose=args.verbose)
-        amazon_photos, amazon_live_photos = amazon_reader.load_all()
-        reporter.stats.total_amazon_files = len(amazon_photos)
-        print(f"  Found {len(amazon_photos)} photos/videos")
-        print(f"  Found {len(amazon_live_photos)} Live Photo pairs")
-
-        # Compute hashes for Amazon photos using parallel processing
-        print(f"\nComputing SHA256 hashes for Amazon photos ({cpu_count} CPU cores)...")
-        with tqdm(total=len(amazon_photos), unit="file", desc="Amazon SHA256") as pbar:
-            def amazon_progress(completed: int, total: int, msg: str) -> None:
-                pbar.update(completed - pbar.n)
+        amazon_reader = AmazonReader(args.amazon_folder, verbose=args.verbose, hash_cache=hash_cache)
+        icloud_reader = ICloudReader(args.icloud_folder, verbose=args.verbose, hash_cache=hash_cache)
 
-            amazon_reader.compute_hashes_parallel(
-                amazon_photos,
-                progress_callback=amazon_progress,
-                compute_phash=False,  # Lazy phash
-            )
+        # Loading is mostly directory and metadata I/O, so the iCloud folder
+        # is loaded in the background while the Amazon folder loads
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            icloud_future = executor.submit(icloud_reader.load_all)
 
-        # Load iCloud photos
-        print("\nLoading iCloud Photos...")
-        icloud_reader = ICloudReader(args.icloud_folder, verbose=args.verbose)
-        icloud_photos, icloud_live_photos = icloud_reader.load_all()
+            # Load Amazon photos
+            print("Loading Amazon Photos...")
+            amazon_photos, amazon_live_photos = amazon_reader.load_all()
+            reporter.stats.total_amazon_files = len(amazon_photos)
+            print(f"  Found {len(amazon_photos)} photos/videos")
+            print(f"  Found {len(amazon_live_photos)} Live Photo pairs")
+
+            # Load iCloud photos
+            print("\nLoading iCloud Photos...")
+            icloud_photos, icloud_live_photos = icloud_future.result()
         reporter.stats.total_icloud_files = len(icloud_photos)
         print(f"  Found {len(icloud_photos)} photos/videos")
         print(f"  Found {len(icloud_live_photos)} Live Photo pairs")
@@ -154,8 +156,6 @@ def main() -> int:
                 compute_phash=True,  # Need phash for index
             )
 
-        # Compare photos with lazy perceptual hashing
-        print("\nComparing photos (with lazy perceptual hashing)...")
         lazy_phash_count = {"count": 0}
 
         def on_lazy_phash(msg: str) -> None:
@@ -169,6 +169,21 @@ def main() -> int:
             phash_callback=on_lazy_phash,
         )
 
+        # Only files with the same size as an iCloud file can match exactly
+        amazon_to_hash = [p for p in amazon_photos if comparator.needs_sha256(p)]
+        print(f"\nComputing SHA256 hashes for {len(amazon_to_hash)} Amazon photos ({cpu_count} CPU cores)...")
+        with tqdm(total=len(amazon_to_hash), unit="file", desc="Amazon SHA256") as pbar:
+            def amazon_progress(completed: int, total: int, msg: str) -> None:
+                pbar.update(completed - pbar.n)
+
+            amazon_reader.compute_hashes_parallel(
+                amazon_to_hash,
+                progress_callback=amazon_progress,
+                compute_phash=False,  # Lazy phash
+            )
+
+        # Compare photos with lazy perceptual hashing
+        print("\nComparing photos (with lazy perceptual hashing)...")
         with tqdm(total=len(amazon_photos), unit="file", desc="Comparing") as pbar:
             def compare_progress(completed: int, total: int) -> None:
                 pbar.update(completed - pbar.n)
@@ -209,6 +224,10 @@ def main() -> int:
 
             traceback.print_exc()
         return 1
+    finally:
+        reporter.close()
+        if hash_cache:
+            hash_cache.close()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ from photo_restore.comparison.comparators import (
     video_match,
 )
 from photo_restore.comparison.live_photos import LivePhotoHandler
+from photo_restore.comparison.phash_index import PhashIndex
 
 __all__ = [
     "DIMENSION_TOLERANCE",
@@ -28,4 +29,5 @@ __all__ = [
     "perceptual_match",
     "video_match",
     "LivePhotoHandler",
+    "PhashIndex",
 ]
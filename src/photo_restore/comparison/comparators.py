@@ -1,12 +1,18 @@
 """Comparison logic for matching photos between Amazon and iCloud."""
 
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable, Optional
 
-import imagehash
-from dateutil import parser as date_parser
+import numpy as np
+from PIL import Image
 
+from photo_restore.comparison.phash_index import PhashIndex
+from photo_restore.core.hashing import compute_sha256, parse_date, phash_image
 from photo_restore.core.models import ComparisonResult, MatchResult, PhotoAsset
+from photo_restore.core.progress import ProgressThrottle
 
 # Thresholds
 PERCEPTUAL_MATCH_THRESHOLD = 5
@@ -16,6 +22,16 @@ DATE_TOLERANCE_SECONDS = 300
 VIDEO_DURATION_TOLERANCE = 1.0
 DIMENSION_TOLERANCE = 0.02
 
+# Highest confidence metadata_match, video_match or an uncertain perceptual
+# match can return (date, dimensions and size all match)
+MAX_METADATA_CONFIDENCE = 0.85
+
+# Below this many Amazon assets, compare_all stays in-process
+PARALLEL_COMPARE_MIN_ASSETS = 1000
+
+# Upper bound on Amazon assets compared per worker task
+MAX_COMPARE_CHUNK_SIZE = 64
+
 
 def _dimension_ratio(a: int, b: int) -> float:
     """Calculate the ratio of two dimensions (0.0 to 1.0)."""
@@ -25,93 +41,139 @@ def _dimension_ratio(a: int, b: int) -> float:
 
 
 def dimensions_match(dim1: tuple[int, int], dim2: tuple[int, int], tolerance: float = DIMENSION_TOLERANCE) -> bool:
-    """Check if dimensions match within tolerance, accounting for rotation."""
+    """
+    Check if dimensions match within tolerance, accounting for rotation.
+
+    A 90 degree rotation swaps width and height, and pairing short side with
+    short side and long with long is always the closer of the two
+    orientations, so only that pairing needs checking.
+    """
     w1, h1 = dim1
     w2, h2 = dim2
     min_ratio = 1 - tolerance
 
-    # Check normal orientation
-    if _dimension_ratio(w1, w2) >= min_ratio and _dimension_ratio(h1, h2) >= min_ratio:
-        return True
+    if _dimension_ratio(min(w1, h1), min(w2, h2)) < min_ratio:
+        return False
+    return _dimension_ratio(max(w1, h1), max(w2, h2)) >= min_ratio
+
 
-    # Check rotated orientation (90 degree rotation swaps width and height)
-    return _dimension_ratio(w1, h2) >= min_ratio and _dimension_ratio(h1, w2) >= min_ratio
+def _asset_datetime(asset: PhotoAsset) -> Optional[datetime]:
+    """Get the asset's parsed exif_date, parsing it once if the reader didn't."""
+    if asset.exif_dt is None and asset.exif_date:
+        asset.exif_dt = parse_date(asset.exif_date)
+    return asset.exif_dt
 
 
-def _dates_match(date1: Optional[str], date2: Optional[str], tolerance_seconds: float = DATE_TOLERANCE_SECONDS) -> bool:
-    """Check if two date strings match within tolerance."""
-    if not date1 or not date2:
+def _asset_timestamp(asset: PhotoAsset) -> float:
+    """
+    Get the asset's date as unix seconds, or NaN if it has none.
+
+    Naive datetimes are read as UTC so differences between them are the same
+    as _dates_match computes, regardless of the local timezone.
+    """
+    dt = _asset_datetime(asset)
+    if dt is None:
+        return float("nan")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    try:
+        return dt.timestamp()
+    except (OverflowError, OSError, ValueError):
+        return float("nan")
+
+
+def _dates_match(asset1: PhotoAsset, asset2: PhotoAsset, tolerance_seconds: float = DATE_TOLERANCE_SECONDS) -> bool:
+    """Check if two assets' dates match within tolerance."""
+    dt1 = _asset_datetime(asset1)
+    dt2 = _asset_datetime(asset2)
+    if dt1 is None or dt2 is None:
         return False
     try:
-        dt1 = date_parser.parse(date1)
-        dt2 = date_parser.parse(date2)
         return abs((dt1 - dt2).total_seconds()) <= tolerance_seconds
-    except (ValueError, TypeError):
+    except TypeError:
+        # Mixing timezone-aware and naive datetimes
         return False
 
 
-def exact_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonResult]:
-    """Compare SHA256 hashes for exact match."""
-    if not amazon.sha256 or not icloud.sha256 or amazon.sha256 != icloud.sha256:
-        return None
+# (match type, confidence, reason format string, reason format arguments)
+MatchScore = tuple[MatchResult, float, str, tuple]
+
 
+def _build_result(amazon: PhotoAsset, icloud: PhotoAsset, score: MatchScore) -> ComparisonResult:
+    """Create the ComparisonResult for a match score, formatting its reason."""
+    match_type, confidence, reason, reason_args = score
     return ComparisonResult(
         amazon_asset=amazon,
-        match_type=MatchResult.EXACT,
+        match_type=match_type,
         matched_icloud_asset=icloud,
-        confidence=1.0,
-        reason="SHA256 hash match",
+        confidence=confidence,
+        reason=reason.format(*reason_args) if reason_args else reason,
     )
 
 
-def _compute_hash_distance(phash1: str, phash2: str) -> Optional[int]:
-    """Compute Hamming distance between two perceptual hashes."""
-    try:
-        hash1 = imagehash.hex_to_hash(phash1)
-        hash2 = imagehash.hex_to_hash(phash2)
-        return hash1 - hash2
-    except Exception:
+def _exact_score(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[MatchScore]:
+    """Score an exact SHA256 match."""
+    if not amazon.sha256 or not icloud.sha256 or amazon.sha256 != icloud.sha256:
         return None
+    return (MatchResult.EXACT, 1.0, "SHA256 hash match", ())
 
 
-def perceptual_match(
+def exact_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonResult]:
+    """Compare SHA256 hashes for exact match."""
+    score = _exact_score(amazon, icloud)
+    return _build_result(amazon, icloud, score) if score else None
+
+
+def _compute_hash_distance(phash1: int, phash2: int) -> int:
+    """Compute Hamming distance between two perceptual hashes."""
+    return (phash1 ^ phash2).bit_count()
+
+
+def _perceptual_score(
     amazon: PhotoAsset,
     icloud: PhotoAsset,
     threshold: int = PERCEPTUAL_MATCH_THRESHOLD,
     uncertain_threshold: int = PERCEPTUAL_UNCERTAIN_THRESHOLD,
-) -> Optional[ComparisonResult]:
-    """Compare perceptual hashes for similar images."""
+) -> Optional[MatchScore]:
+    """Score a perceptual hash match for similar images."""
     if amazon.is_video or icloud.is_video:
         return None
 
-    if not amazon.phash or not icloud.phash:
+    if amazon.phash is None or icloud.phash is None:
         return None
 
     distance = _compute_hash_distance(amazon.phash, icloud.phash)
-    if distance is None:
-        return None
 
     if distance <= threshold:
-        return ComparisonResult(
-            amazon_asset=amazon,
-            match_type=MatchResult.PERCEPTUAL,
-            matched_icloud_asset=icloud,
-            confidence=1.0 - (distance / 64.0),
-            reason=f"Perceptual hash match (distance={distance})",
+        return (
+            MatchResult.PERCEPTUAL,
+            1.0 - (distance / 64.0),
+            "Perceptual hash match (distance={})",
+            (distance,),
         )
 
     if distance <= uncertain_threshold:
-        return ComparisonResult(
-            amazon_asset=amazon,
-            match_type=MatchResult.UNCERTAIN,
-            matched_icloud_asset=icloud,
-            confidence=0.5 - (distance - threshold) / (64.0 - threshold),
-            reason=f"Perceptual hash close match (distance={distance})",
+        return (
+            MatchResult.UNCERTAIN,
+            0.5 - (distance - threshold) / (64.0 - threshold),
+            "Perceptual hash close match (distance={})",
+            (distance,),
         )
 
     return None
 
 
+def perceptual_match(
+    amazon: PhotoAsset,
+    icloud: PhotoAsset,
+    threshold: int = PERCEPTUAL_MATCH_THRESHOLD,
+    uncertain_threshold: int = PERCEPTUAL_UNCERTAIN_THRESHOLD,
+) -> Optional[ComparisonResult]:
+    """Compare perceptual hashes for similar images."""
+    score = _perceptual_score(amazon, icloud, threshold, uncertain_threshold)
+    return _build_result(amazon, icloud, score) if score else None
+
+
 def _compute_size_ratio(size1: int, size2: int) -> float:
     """Compute file size ratio, returning 0.0 if denominator is zero."""
     if size2 == 0:
@@ -119,9 +181,9 @@ def _compute_size_ratio(size1: int, size2: int) -> float:
     return size1 / size2
 
 
-def metadata_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonResult]:
-    """Compare metadata (date, dimensions, size) for match."""
-    if not _dates_match(amazon.exif_date, icloud.exif_date):
+def _metadata_score(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[MatchScore]:
+    """Score a metadata (date, dimensions, size) match."""
+    if not _dates_match(amazon, icloud):
         return None
 
     has_dimensions = amazon.dimensions and icloud.dimensions
@@ -131,34 +193,27 @@ def metadata_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[Compariso
     size_matched = (1 - SIZE_TOLERANCE) <= size_ratio <= (1 + SIZE_TOLERANCE)
 
     if dimensions_matched and size_matched:
-        confidence = 0.85
-        reason = "Metadata match (date, dimensions, size all match)"
-    elif dimensions_matched:
-        confidence = 0.7
-        reason = f"Metadata match (date + dimensions, size ratio={size_ratio:.2f})"
-    elif size_matched:
-        confidence = 0.65
-        reason = "Metadata match (date + size, dimensions differ)"
-    else:
-        confidence = 0.5
-        reason = f"Weak metadata match (date only, size ratio={size_ratio:.2f})"
+        return (MatchResult.METADATA, MAX_METADATA_CONFIDENCE, "Metadata match (date, dimensions, size all match)", ())
+    if dimensions_matched:
+        return (MatchResult.METADATA, 0.7, "Metadata match (date + dimensions, size ratio={:.2f})", (size_ratio,))
+    if size_matched:
+        return (MatchResult.METADATA, 0.65, "Metadata match (date + size, dimensions differ)", ())
+    return (MatchResult.METADATA, 0.5, "Weak metadata match (date only, size ratio={:.2f})", (size_ratio,))
 
-    return ComparisonResult(
-        amazon_asset=amazon,
-        match_type=MatchResult.METADATA,
-        matched_icloud_asset=icloud,
-        confidence=confidence,
-        reason=reason,
-    )
+
+def metadata_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonResult]:
+    """Compare metadata (date, dimensions, size) for match."""
+    score = _metadata_score(amazon, icloud)
+    return _build_result(amazon, icloud, score) if score else None
 
 
-def video_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonResult]:
-    """Compare video metadata for match."""
+def _video_score(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[MatchScore]:
+    """Score a video metadata match."""
     if not amazon.is_video or not icloud.is_video:
         return None
 
     # Date match is required
-    if not _dates_match(amazon.exif_date, icloud.exif_date):
+    if not _dates_match(amazon, icloud):
         return None
 
     # Dimensions must match if both are available
@@ -204,32 +259,20 @@ def video_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonRe
         return None
 
     confidence = sum(confidence_factors) / len(confidence_factors)
+    return (MatchResult.METADATA, confidence, "Video match ({})", (", ".join(reasons),))
 
-    return ComparisonResult(
-        amazon_asset=amazon,
-        match_type=MatchResult.METADATA,
-        matched_icloud_asset=icloud,
-        confidence=confidence,
-        reason=f"Video match ({', '.join(reasons)})",
-    )
 
-
-def _update_best_result(
-    current_best: Optional[ComparisonResult],
-    candidate: Optional[ComparisonResult],
-) -> Optional[ComparisonResult]:
-    """Return the higher confidence result between current best and candidate."""
-    if candidate is None:
-        return current_best
-    if current_best is None or candidate.confidence > current_best.confidence:
-        return candidate
-    return current_best
+def video_match(amazon: PhotoAsset, icloud: PhotoAsset) -> Optional[ComparisonResult]:
+    """Compare video metadata for match."""
+    score = _video_score(amazon, icloud)
+    return _build_result(amazon, icloud, score) if score else None
 
 
 def compare(
     amazon: PhotoAsset,
     icloud_assets: list[PhotoAsset],
     perceptual_threshold: int = PERCEPTUAL_MATCH_THRESHOLD,
+    stop_confidence: Optional[float] = None,
 ) -> ComparisonResult:
     """
     Compare an Amazon asset against all iCloud assets.
@@ -239,26 +282,44 @@ def compare(
     2. Perceptual hash match (images only)
     3. Metadata match (images) or Video match (videos)
 
-    Returns the best match found, or NO_MATCH if none found.
+    Returns the best match found, or NO_MATCH if none found. If
+    stop_confidence is given, the scan stops once the best match reaches it;
+    callers that already ruled out exact and perceptual matches can pass
+    MAX_METADATA_CONFIDENCE, since no later candidate could then do better.
+
+    Candidates are scored as plain tuples and only the winning one becomes
+    a ComparisonResult. Checks that only depend on the Amazon asset (whether
+    it has a SHA256 or phash at all) are made once, not per candidate.
     """
-    best_result: Optional[ComparisonResult] = None
+    # An exact match wins over anything else, wherever it is in the list
+    if amazon.sha256:
+        for icloud in icloud_assets:
+            if icloud.sha256 == amazon.sha256:
+                return _build_result(amazon, icloud, _exact_score(amazon, icloud))
+
+    best_score: Optional[MatchScore] = None
+    best_icloud: Optional[PhotoAsset] = None
+    check_phash = not amazon.is_video and amazon.phash is not None
 
     for icloud in icloud_assets:
-        result = exact_match(amazon, icloud)
-        if result:
-            return result
+        if stop_confidence is not None and best_score and best_score[1] >= stop_confidence:
+            break
 
         if amazon.is_video:
-            best_result = _update_best_result(best_result, video_match(amazon, icloud))
+            scores = (_video_score(amazon, icloud),)
         else:
-            result = perceptual_match(amazon, icloud, perceptual_threshold)
-            if result and result.match_type == MatchResult.PERCEPTUAL:
-                return result
-            best_result = _update_best_result(best_result, result)
-            best_result = _update_best_result(best_result, metadata_match(amazon, icloud))
+            score = _perceptual_score(amazon, icloud, perceptual_threshold) if check_phash else None
+            if score and score[0] == MatchResult.PERCEPTUAL:
+                return _build_result(amazon, icloud, score)
+            scores = (score, _metadata_score(amazon, icloud))
+
+        # Keep the first of equally confident matches
+        for score in scores:
+            if score and (best_score is None or score[1] > best_score[1]):
+                best_score, best_icloud = score, icloud
 
-    if best_result:
-        return best_result
+    if best_score:
+        return _build_result(amazon, best_icloud, best_score)
 
     return ComparisonResult(
         amazon_asset=amazon,
@@ -269,19 +330,45 @@ def compare(
     )
 
 
-def compute_phash_for_asset(path: Path) -> Optional[str]:
+def compute_phash_for_asset(path: Path) -> Optional[int]:
     """Compute perceptual hash for a single image file."""
     try:
-        from PIL import Image
-        import pillow_heif
-        pillow_heif.register_heif_opener()
-
         with Image.open(path) as img:
-            return str(imagehash.phash(img))
+            return phash_image(img)
     except Exception:
         return None
 
 
+# Comparator and iCloud asset positions held by each compare worker process
+_worker_comparator: Optional["PhotoComparator"] = None
+_worker_positions: dict[int, int] = {}
+
+
+def _init_compare_worker(comparator: "PhotoComparator") -> None:
+    """Store the comparator in a compare worker process."""
+    global _worker_comparator, _worker_positions
+    _worker_comparator = comparator
+    _worker_positions = {id(asset): i for i, asset in enumerate(comparator.icloud_assets)}
+
+
+def _compare_chunk(assets: list[PhotoAsset]) -> list[tuple]:
+    """
+    Compare a chunk of Amazon assets in a worker process.
+
+    Returns (match_type, matched iCloud position, confidence, reason, sha256,
+    phash) per asset so the parent can rebuild results around its own objects.
+    """
+    summaries = []
+    for amazon in assets:
+        result = _worker_comparator.compare_asset(amazon)
+        matched = result.matched_icloud_asset
+        position = _worker_positions[id(matched)] if matched is not None else None
+        summaries.append(
+            (result.match_type, position, result.confidence, result.reason, amazon.sha256, amazon.phash)
+        )
+    return summaries
+
+
 class PhotoComparator:
     """Comparator class for batch photo comparison with lazy hashing support."""
 
@@ -300,28 +387,39 @@ class PhotoComparator:
         self.phash_callback = phash_callback
 
         self._by_sha256: dict[str, PhotoAsset] = {}
-        self._by_dimensions_date: dict[tuple, list[PhotoAsset]] = {}
-        self._by_date: dict[str, list[PhotoAsset]] = {}
-        self._phash_index: dict[str, list[PhotoAsset]] = {}
+        self._sha256_sizes: set[int] = set()
+        self._phash_assets: list[PhotoAsset] = []
+        self._phash_positions = np.empty(0, dtype=np.intp)
+        self._phash_index = PhashIndex([])
+        self._sorted_timestamps = np.empty(0, dtype=np.float64)
+        self._timestamp_positions = np.empty(0, dtype=np.intp)
 
         self._build_indexes(icloud_assets)
 
     def _build_indexes(self, assets: list[PhotoAsset]) -> None:
         """Build lookup indexes for faster matching."""
-        for asset in assets:
+        phash_values: list[int] = []
+        phash_positions: list[int] = []
+
+        for i, asset in enumerate(assets):
             if asset.sha256:
                 self._by_sha256[asset.sha256] = asset
+                self._sha256_sizes.add(asset.file_size)
 
-            dim_date_key = (asset.dimensions, asset.exif_date[:10] if asset.exif_date else None)
-            self._by_dimensions_date.setdefault(dim_date_key, []).append(asset)
+            if asset.phash is not None:
+                self._phash_assets.append(asset)
+                phash_values.append(asset.phash)
+                phash_positions.append(i)
 
-            if asset.exif_date:
-                date_key = asset.exif_date[:10]
-                self._by_date.setdefault(date_key, []).append(asset)
+        self._phash_index = PhashIndex(phash_values)
+        self._phash_positions = np.array(phash_positions, dtype=np.intp)
 
-            if asset.phash:
-                phash_prefix = asset.phash[:4]
-                self._phash_index.setdefault(phash_prefix, []).append(asset)
+        # Dated assets sorted by timestamp, so a date window is a binary search
+        timestamps = np.array([_asset_timestamp(asset) for asset in assets], dtype=np.float64)
+        dated = np.flatnonzero(~np.isnan(timestamps))
+        order = np.argsort(timestamps[dated], kind="stable")
+        self._timestamp_positions = dated[order]
+        self._sorted_timestamps = timestamps[self._timestamp_positions]
 
     def _log(self, message: str) -> None:
         """Log message if verbose mode is enabled."""
@@ -335,34 +433,27 @@ class PhotoComparator:
                 self.phash_callback(f"Computing phash for {asset.path.name}")
             asset.phash = compute_phash_for_asset(asset.path)
 
-    def _get_phash_candidates(self, amazon: PhotoAsset) -> set[PhotoAsset]:
-        """Get candidate iCloud assets based on perceptual hash prefix."""
-        if not amazon.phash:
-            return set()
+    def needs_sha256(self, asset: PhotoAsset) -> bool:
+        """
+        Check whether the asset still needs a SHA256 for exact matching.
 
-        candidates: set[PhotoAsset] = set()
-        prefix = amazon.phash[:4]
+        Identical files have identical sizes, so an asset can only match
+        exactly if some hashed iCloud asset has the same file size.
+        """
+        return asset.sha256 is None and asset.file_size in self._sha256_sizes
 
-        if prefix in self._phash_index:
-            candidates.update(self._phash_index[prefix])
+    def _ensure_sha256(self, asset: PhotoAsset) -> None:
+        """Ensure the asset has a SHA256 if it could match exactly (lazy computation)."""
+        if self.needs_sha256(asset):
+            asset.sha256 = compute_sha256(asset.path)
 
-        self._add_neighboring_prefix_candidates(prefix, candidates)
-        return candidates
+    def _get_phash_candidates(self, amazon: PhotoAsset) -> list[PhotoAsset]:
+        """Get iCloud assets within the perceptual threshold of the asset's phash, nearest first."""
+        if amazon.phash is None or not self._phash_assets:
+            return []
 
-    def _add_neighboring_prefix_candidates(self, prefix: str, candidates: set[PhotoAsset]) -> None:
-        """Add candidates from neighboring phash prefixes for better coverage."""
-        try:
-            prefix_int = int(prefix, 16)
-        except ValueError:
-            return
-
-        neighbor_deltas = [-1, 1, -16, 16, -17, 17, -15, 15, -256, 256, -4096, 4096]
-        for delta in neighbor_deltas:
-            neighbor = prefix_int + delta
-            if 0 <= neighbor <= 0xFFFF:
-                neighbor_prefix = f"{neighbor:04x}"
-                if neighbor_prefix in self._phash_index:
-                    candidates.update(self._phash_index[neighbor_prefix])
+        indices, _ = self._phash_index.search(amazon.phash, self.perceptual_threshold)
+        return [self._phash_assets[i] for i in indices]
 
     def _try_sha256_match(self, amazon: PhotoAsset) -> Optional[ComparisonResult]:
         """Try to find an exact SHA256 match."""
@@ -378,61 +469,194 @@ class PhotoComparator:
 
     def _try_perceptual_match(self, amazon: PhotoAsset) -> Optional[ComparisonResult]:
         """Try to find a perceptual hash match from indexed candidates."""
-        if amazon.is_video or not amazon.phash:
+        if amazon.is_video or amazon.phash is None:
+            return None
+
+        candidates = self._get_phash_candidates(amazon)
+        if not candidates:
             return None
 
-        for icloud in self._get_phash_candidates(amazon):
-            result = perceptual_match(amazon, icloud, self.perceptual_threshold)
-            if result and result.match_type == MatchResult.PERCEPTUAL:
-                return result
+        result = perceptual_match(amazon, candidates[0], self.perceptual_threshold)
+        if result and result.match_type == MatchResult.PERCEPTUAL:
+            return result
         return None
 
     def _get_comparison_candidates(self, amazon: PhotoAsset) -> list[PhotoAsset]:
-        """Get candidate assets for comparison using indexes."""
-        dim_date_key = (amazon.dimensions, amazon.exif_date[:10] if amazon.exif_date else None)
-        if dim_date_key in self._by_dimensions_date:
-            return self._by_dimensions_date[dim_date_key]
-
-        if amazon.exif_date:
-            date_key = amazon.exif_date[:10]
-            if date_key in self._by_date:
-                return self._by_date[date_key]
-
-        return self.icloud_assets
+        """
+        Get the iCloud assets that could produce a match for the asset.
+
+        Metadata and video matches need dates within DATE_TOLERANCE_SECONDS,
+        found by binary search over the sorted iCloud timestamps. Uncertain
+        perceptual matches need no date, so assets within the uncertain phash
+        distance are added from the phash index. Candidates keep library order.
+        """
+        positions = []
+
+        timestamp = _asset_timestamp(amazon)
+        if not np.isnan(timestamp):
+            lo = np.searchsorted(self._sorted_timestamps, timestamp - DATE_TOLERANCE_SECONDS, side="left")
+            hi = np.searchsorted(self._sorted_timestamps, timestamp + DATE_TOLERANCE_SECONDS, side="right")
+            positions.append(self._timestamp_positions[lo:hi])
+
+        if amazon.phash is not None and not amazon.is_video and len(self._phash_index):
+            max_distance = max(self.perceptual_threshold, PERCEPTUAL_UNCERTAIN_THRESHOLD)
+            indices, _ = self._phash_index.search(amazon.phash, max_distance)
+            positions.append(self._phash_positions[indices])
+
+        if not positions:
+            return []
+        return [self.icloud_assets[i] for i in np.unique(np.concatenate(positions))]
 
     def compare_asset(self, amazon: PhotoAsset) -> ComparisonResult:
         """Compare a single Amazon asset against iCloud library."""
+        self._ensure_sha256(amazon)
         result = self._try_sha256_match(amazon)
         if result:
             return result
 
-        if self.lazy_phash:
+        # Without any iCloud phashes there is nothing to compare a phash to
+        if self.lazy_phash and len(self._phash_index):
             self._ensure_phash(amazon)
 
         result = self._try_perceptual_match(amazon)
         if result:
             return result
 
+        # Exact and perceptual matches were ruled out above, so the best
+        # remaining result can't beat a full metadata match
         candidates = self._get_comparison_candidates(amazon)
-        return compare(amazon, candidates, self.perceptual_threshold)
+        return compare(amazon, candidates, self.perceptual_threshold, stop_confidence=MAX_METADATA_CONFIDENCE)
+
+    def __getstate__(self) -> dict:
+        """Drop the callback when sending the comparator to compare workers."""
+        state = self.__dict__.copy()
+        state["phash_callback"] = None
+        return state
+
+    def _apply_worker_summary(self, amazon: PhotoAsset, summary: tuple) -> ComparisonResult:
+        """Rebuild a worker's comparison result around the parent's asset objects."""
+        match_type, position, confidence, reason, sha256, phash = summary
+
+        amazon.sha256 = sha256
+        if amazon.phash is None and phash is not None:
+            if self.phash_callback:
+                self.phash_callback(f"Computing phash for {amazon.path.name}")
+            amazon.phash = phash
+
+        return ComparisonResult(
+            amazon_asset=amazon,
+            match_type=match_type,
+            matched_icloud_asset=self.icloud_assets[position] if position is not None else None,
+            confidence=confidence,
+            reason=reason,
+        )
+
+    def _compare_all_parallel(
+        self,
+        amazon_assets: list[PhotoAsset],
+        max_workers: int,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> list[ComparisonResult]:
+        """
+        Compare Amazon assets across worker processes.
+
+        Each worker receives the comparator once, through the pool
+        initializer (inherited without copying where fork is used), and
+        only chunks of Amazon assets travel per task.
+        """
+        total = len(amazon_assets)
+        chunk_size = max(1, min(MAX_COMPARE_CHUNK_SIZE, total // (max_workers * 4)))
+        results: list[Optional[ComparisonResult]] = [None] * total
+        completed = 0
+        progress = ProgressThrottle(progress_callback, total) if progress_callback else None
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_compare_worker,
+            initargs=(self,),
+        ) as executor:
+            futures = {
+                executor.submit(_compare_chunk, amazon_assets[start : start + chunk_size]): start
+                for start in range(0, total, chunk_size)
+            }
+
+            for future in as_completed(futures):
+                start = futures[future]
+                summaries = future.result()
+                for offset, summary in enumerate(summaries):
+                    results[start + offset] = self._apply_worker_summary(amazon_assets[start + offset], summary)
+
+                completed += len(summaries)
+                self._log(f"Compared {completed}/{total}...")
+                if progress and completed < total:
+                    progress(completed)
+
+        return results
+
+    def _prefetch_phashes(
+        self, executor: ThreadPoolExecutor, amazon_assets: list[PhotoAsset]
+    ) -> dict[int, Future]:
+        """
+        Start computing the phashes compare_all will need, keyed by asset position.
+
+        Decoding releases the GIL, so images are read and hashed on worker
+        threads while the main loop compares earlier assets. Assets that may
+        still match exactly by SHA256 are left to the lazy path, since an
+        exact match never needs their phash.
+        """
+        return {
+            i: executor.submit(compute_phash_for_asset, asset.path)
+            for i, asset in enumerate(amazon_assets)
+            if asset.phash is None
+            and not asset.is_video
+            and not (asset.sha256 and asset.sha256 in self._by_sha256)
+            and not self.needs_sha256(asset)
+        }
 
     def compare_all(
         self,
         amazon_assets: list[PhotoAsset],
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_workers: Optional[int] = None,
     ) -> list[ComparisonResult]:
-        """Compare all Amazon assets against iCloud library."""
-        results = []
+        """
+        Compare all Amazon assets against iCloud library.
+
+        Large batches are spread over max_workers processes (defaults to the
+        CPU count); pass max_workers=1 to always compare in-process.
+        """
         total = len(amazon_assets)
+        workers = max_workers or os.cpu_count() or 4
 
-        for i, amazon in enumerate(amazon_assets):
-            if self.verbose and i % 100 == 0:
-                self._log(f"Comparing {i + 1}/{total}...")
+        if workers > 1 and total >= PARALLEL_COMPARE_MIN_ASSETS:
+            results = self._compare_all_parallel(amazon_assets, workers, progress_callback)
+            if progress_callback:
+                progress_callback(total, total)
+            return results
 
-            if progress_callback and i % 10 == 0:
-                progress_callback(i, total)
+        results = []
+        progress = ProgressThrottle(progress_callback, total) if progress_callback else None
+        executor = ThreadPoolExecutor(max_workers=workers) if self.lazy_phash and len(self._phash_index) else None
+        prefetched = self._prefetch_phashes(executor, amazon_assets) if executor else {}
 
-            results.append(self.compare_asset(amazon))
+        try:
+            for i, amazon in enumerate(amazon_assets):
+                if self.verbose and i % 100 == 0:
+                    self._log(f"Comparing {i + 1}/{total}...")
+
+                if progress:
+                    progress(i)
+
+                future = prefetched.pop(i, None)
+                if future is not None and amazon.phash is None:
+                    if self.phash_callback:
+                        self.phash_callback(f"Computing phash for {amazon.path.name}")
+                    amazon.phash = future.result()
+
+                results.append(self.compare_asset(amazon))
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
 
         if progress_callback:
             progress_callback(total, total)
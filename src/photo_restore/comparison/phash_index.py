@@ -0,0 +1,105 @@
+"""Multi-index hashing for perceptual hash lookup by Hamming distance."""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# 64-bit hashes are split into this many 16-bit chunks
+NUM_CHUNKS = 4
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+# Rough cost of one bucket probe, measured in hashes scanned by numpy
+PROBE_COST = 64
+
+
+@lru_cache(maxsize=None)
+def _chunk_flip_masks(radius: int) -> np.ndarray:
+    """All 16-bit masks with at most `radius` bits set."""
+    masks = np.array([m for m in range(1 << CHUNK_BITS) if m.bit_count() <= radius], dtype=np.intp)
+    masks.setflags(write=False)
+    return masks
+
+
+class PhashIndex:
+    """
+    Index of 64-bit perceptual hashes supporting Hamming radius queries.
+
+    Each hash is split into four 16-bit chunks and every chunk position gets
+    its own bucket table. Two hashes within distance d must agree on at least
+    one chunk to within d // 4 bits (pigeonhole), so probing each chunk's
+    neighbors within that radius finds every match without scanning the
+    whole library. Candidates are verified with a vectorized XOR + popcount.
+    """
+
+    def __init__(self, values: list[int]):
+        self._values = np.array(values, dtype=np.uint64)
+        self._tables: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _build_tables(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Build the bucket tables for all chunk positions on first use.
+
+        Returns (order, starts). For chunk position j, order holds the hash
+        indices sorted by chunk value, and the indices whose chunk equals k
+        are order[starts[j, k]:starts[j, k + 1]]. Buckets are slices of one
+        flat array instead of per-bucket lists, so a query gathers them with
+        a few vectorized operations.
+        """
+        n = len(self._values)
+        order = np.empty(NUM_CHUNKS * n, dtype=np.intp)
+        starts = np.empty((NUM_CHUNKS, CHUNK_MASK + 2), dtype=np.intp)
+
+        for j in range(NUM_CHUNKS):
+            keys = ((self._values >> np.uint64(CHUNK_BITS * j)) & np.uint64(CHUNK_MASK)).astype(np.intp)
+            order[j * n : (j + 1) * n] = np.argsort(keys, kind="stable")
+            starts[j, 0] = j * n
+            np.cumsum(np.bincount(keys, minlength=CHUNK_MASK + 1), out=starts[j, 1:])
+            starts[j, 1:] += j * n
+
+        return order, starts
+
+    def _candidates(self, query: int, masks: np.ndarray) -> np.ndarray:
+        """Collect indices of hashes sharing a near-identical chunk with the query."""
+        if self._tables is None:
+            self._tables = self._build_tables()
+        order, starts = self._tables
+
+        # Neighbor keys for every chunk position at once, shape (NUM_CHUNKS, len(masks))
+        query_chunks = np.array(
+            [(query >> (CHUNK_BITS * j)) & CHUNK_MASK for j in range(NUM_CHUNKS)], dtype=np.intp
+        )
+        keys = query_chunks[:, None] ^ masks[None, :]
+        rows = np.arange(NUM_CHUNKS)[:, None]
+        lo = starts[rows, keys].ravel()
+        lengths = starts[rows, keys + 1].ravel() - lo
+
+        # Expand the bucket slices into one array of positions in `order`
+        ends = np.cumsum(lengths)
+        positions = np.arange(ends[-1]) + np.repeat(lo - ends + lengths, lengths)
+        return np.unique(order[positions])
+
+    def search(self, query: int, max_distance: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find hashes within max_distance of query.
+
+        Returns (indices, distances), nearest first with ties in index order.
+        """
+        masks = _chunk_flip_masks(min(max_distance // NUM_CHUNKS, CHUNK_BITS))
+
+        # Small libraries (or wide radii) are cheaper to scan in full
+        if len(masks) * NUM_CHUNKS * PROBE_COST >= len(self):
+            indices = np.arange(len(self))
+            distances = np.bitwise_count(self._values ^ np.uint64(query))
+        else:
+            indices = self._candidates(query, masks)
+            distances = np.bitwise_count(self._values[indices] ^ np.uint64(query))
+
+        keep = distances <= max_distance
+        indices, distances = indices[keep], distances[keep]
+        order = np.lexsort((indices, distances))
+        return indices[order], distances[order]
@@ -1,12 +1,18 @@
 """Core modules for photo_restore."""
 
 from photo_restore.core.constants import ALL_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from photo_restore.core.hash_cache import HashCache, open_hash_cache
 from photo_restore.core.hashing import (
     compute_phash,
     compute_sha256,
     get_exif_date,
     get_file_date,
     get_image_dimensions,
+    parse_date,
+    phash_image,
+    probe_image,
+    sha256_and_phash,
+    sha256_file,
 )
 from photo_restore.core.models import (
     ComparisonResult,
@@ -17,16 +23,25 @@ from photo_restore.core.models import (
     ProcessingStats,
 )
 from photo_restore.core.parallel_hasher import ParallelHasher
+from photo_restore.core.progress import ProgressThrottle
+from photo_restore.core.scanning import scan_media_entries
 
 __all__ = [
     "ALL_EXTENSIONS",
     "IMAGE_EXTENSIONS",
     "VIDEO_EXTENSIONS",
+    "HashCache",
+    "open_hash_cache",
     "compute_phash",
     "compute_sha256",
     "get_exif_date",
     "get_file_date",
     "get_image_dimensions",
+    "parse_date",
+    "phash_image",
+    "probe_image",
+    "sha256_and_phash",
+    "sha256_file",
     "ComparisonResult",
     "LivePhoto",
     "LivePhotoComparisonResult",
@@ -34,4 +49,6 @@ __all__ = [
     "PhotoAsset",
     "ProcessingStats",
     "ParallelHasher",
+    "ProgressThrottle",
+    "scan_media_entries",
 ]
@@ -1,10 +1,13 @@
 """Shared constants for photo_restore."""
 
 # Supported image extensions
-IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".heic", ".heif", ".png", ".gif", ".webp", ".tiff", ".tif", ".bmp"}
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".heic", ".heif", ".png", ".gif", ".webp", ".tiff", ".tif", ".bmp"})
 
 # Video file extensions
-VIDEO_EXTENSIONS = {".mov", ".mp4", ".m4v", ".avi", ".mkv", ".3gp"}
+VIDEO_EXTENSIONS = frozenset({".mov", ".mp4", ".m4v", ".avi", ".mkv", ".3gp"})
 
 # All supported extensions
 ALL_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
+
+# Directories never scanned for media: OS trash/metadata folders and zip-extraction debris
+SKIPPED_DIRS = frozenset({"node_modules", "__MACOSX", "System Volume Information", "$RECYCLE.BIN"})
@@ -0,0 +1,118 @@
+"""Persistent SHA256/phash cache shared across runs."""
+
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# (st_mtime_ns, st_size) of a file when it was hashed
+FileKey = tuple[int, int]
+
+# (sha256, phash) for a file; either may be None if never computed
+CachedHashes = tuple[Optional[str], Optional[int]]
+
+
+def default_cache_path() -> Path:
+    """Get the cache database location, honouring XDG_CACHE_HOME."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "photo_restore" / "hashes.db"
+
+
+def file_key(path: str | Path) -> Optional[FileKey]:
+    """Get the (mtime, size) a cached hash is valid for, or None if the file can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class HashCache:
+    """
+    SQLite-backed cache of file hashes keyed by absolute path.
+
+    A cached row is only used while the file's mtime and size are unchanged,
+    so edited or replaced files are hashed again. SHA256 and phash are stored
+    independently; an Amazon file hashed for SHA256 alone keeps that hash
+    when its phash is cached later.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else default_cache_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Hashing may be driven from a worker thread (e.g. the web UI)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT, phash TEXT)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: dict[Path, Optional[FileKey]]) -> dict[Path, CachedHashes]:
+        """Look up cached hashes for files whose (mtime, size) still match."""
+        found: dict[Path, CachedHashes] = {}
+        try:
+            for path, key in keys.items():
+                if key is None:
+                    continue
+                row = self._conn.execute(
+                    "SELECT mtime_ns, size, sha256, phash FROM hashes WHERE path = ?",
+                    (os.path.abspath(path),),
+                ).fetchone()
+                if row and (row[0], row[1]) == key:
+                    found[path] = (row[2], int(row[3], 16) if row[3] else None)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read hash cache: {e}")
+        return found
+
+    def put_many(self, entries: dict[Path, tuple[Optional[FileKey], Optional[str], Optional[int]]]) -> None:
+        """
+        Store hashes as {path: (key, sha256, phash)} in a single transaction.
+
+        A None hash keeps the cached value, as long as the row is for the same
+        (mtime, size); files that couldn't be stat'ed are skipped.
+        """
+        rows = [
+            (
+                os.path.abspath(path),
+                key[0],
+                key[1],
+                sha256,
+                f"{phash:016x}" if phash is not None else None,
+            )
+            for path, (key, sha256, phash) in entries.items()
+            if key is not None and (sha256 is not None or phash is not None)
+        ]
+        if not rows:
+            return
+
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO hashes (path, mtime_ns, size, sha256, phash) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET "
+                    "sha256 = COALESCE(excluded.sha256, CASE WHEN mtime_ns = excluded.mtime_ns "
+                    "AND size = excluded.size THEN sha256 END), "
+                    "phash = COALESCE(excluded.phash, CASE WHEN mtime_ns = excluded.mtime_ns "
+                    "AND size = excluded.size THEN phash END), "
+                    "mtime_ns = excluded.mtime_ns, size = excluded.size",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update hash cache: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def open_hash_cache(db_path: Optional[Path] = None) -> Optional[HashCache]:
+    """Open the hash cache, or return None (hashing everything) if it can't be opened."""
+    try:
+        return HashCache(db_path)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Hash cache unavailable, hashing all files: {e}")
+        return None
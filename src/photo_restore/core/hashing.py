@@ -1,46 +1,174 @@
 """Hashing and metadata extraction utilities."""
 
 import hashlib
+import io
 import logging
+import mmap
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import imagehash
+import numpy as np
 import pillow_heif
+from dateutil import parser as date_parser
 from PIL import Image
-from PIL.ExifTags import IFD, TAGS
+from PIL.ExifTags import IFD, Base
 
 logger = logging.getLogger(__name__)
 
 # Register HEIF/HEIC support with Pillow
 pillow_heif.register_heif_opener()
 
+# Files at least this large are hashed straight from a read-only memory map
+SHA256_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# The whole mapping is hashed front to back, so readahead can run far ahead
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+
+# Read buffer size for files hashed without mmap
+SHA256_BUFFER_SIZE = 1024 * 1024
+
+# Per-thread read buffer, reused across files
+_sha256_local = threading.local()
+
+# Images up to this size are read once for both SHA256 and phash
+SINGLE_READ_MAX_SIZE = 64 * 1024 * 1024
+
+# Smallest size the decoder is asked to produce before perceptual hashing
+PHASH_DRAFT_SIZE = 64
+
+# phash keeps the 8x8 lowest frequencies of a DCT over a 32x32 thumbnail
+PHASH_HASH_SIZE = 8
+PHASH_IMAGE_SIZE = 32
+
+# Low-frequency rows of the unnormalized DCT-II basis, so the 2D transform is
+# two small matrix products (same coefficients as scipy.fftpack.dct)
+_DCT_BASIS = 2 * np.cos(
+    np.pi
+    * np.arange(PHASH_HASH_SIZE)[:, None]
+    * (2 * np.arange(PHASH_IMAGE_SIZE)[None, :] + 1)
+    / (2 * PHASH_IMAGE_SIZE)
+)
+
+
+def _sha256_buffer() -> memoryview:
+    """Get this thread's reusable SHA256 read buffer."""
+    buf = getattr(_sha256_local, "buffer", None)
+    if buf is None:
+        buf = _sha256_local.buffer = memoryview(bytearray(SHA256_BUFFER_SIZE))
+    return buf
+
+
+def sha256_file(path: str | Path) -> str:
+    """
+    Hash a file with SHA256, raising OSError if it cannot be read.
+
+    hashlib's sha256 is backed by OpenSSL, which selects the SHA-NI
+    implementation at runtime on CPUs that support it, so every SHA256
+    in the tool goes through this one function.
+
+    Large files (videos, RAW) are memory-mapped and hashed in a single
+    update without copying pages into Python objects. Smaller files, and
+    files that can't be mapped, are read into a per-thread 1 MiB buffer
+    so the loop makes no allocations.
+    """
+    sha256 = hashlib.sha256()
+    # Unbuffered, so reads go straight into the hash buffer without an extra copy
+    with open(path, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size >= SHA256_MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Hint aggressive readahead; not available on Windows
+                    if _MADV_SEQUENTIAL is not None:
+                        mm.madvise(_MADV_SEQUENTIAL)
+                    sha256.update(mm)
+                return sha256.hexdigest()
+            except (OSError, ValueError):
+                # Filesystems without mmap support (some network and FUSE mounts)
+                pass
+
+        buf = _sha256_buffer()
+        while n := f.readinto(buf):
+            sha256.update(buf[:n])
+    return sha256.hexdigest()
+
 
 def compute_sha256(path: Path) -> Optional[str]:
     """Compute SHA256 hash of a file."""
     try:
-        sha256 = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(65536), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        return sha256_file(path)
     except Exception as e:
         logger.warning(f"Failed to compute SHA256 for {path}: {e}")
         return None
 
 
-def compute_phash(path: Path) -> Optional[str]:
+def phash_image(img: Image.Image) -> int:
+    """
+    Compute the perceptual hash of an opened, not yet loaded, image.
+
+    phash only looks at a 32x32 grayscale thumbnail, so the decoder is asked
+    for a reduced grayscale image first; JPEG then decodes at up to 1/8
+    scale and HEIC decodes its embedded thumbnail (pillow-heif >= 1.8)
+    instead of producing full-resolution RGB pixels. Only the 8x8
+    low-frequency DCT block is computed. Every phash in the tool goes
+    through here so Amazon and iCloud hashes stay comparable.
+
+    The hash is returned as a 64-bit integer, so comparing two hashes is a
+    single XOR and popcount.
+    """
+    img.draft("L", (PHASH_DRAFT_SIZE, PHASH_DRAFT_SIZE))
+    thumbnail = img.convert("L").resize(
+        (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), Image.Resampling.LANCZOS
+    )
+    pixels = np.asarray(thumbnail, dtype=np.float64)
+
+    # Same bits as imagehash.phash: set where a coefficient is above the
+    # median, packed row-major, most significant bit first
+    low = _DCT_BASIS @ pixels @ _DCT_BASIS.T
+    bits = np.packbits(low > np.median(low))
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def compute_phash(path: Path) -> Optional[int]:
     """Compute perceptual hash of an image."""
     try:
         with Image.open(path) as img:
-            return str(imagehash.phash(img))
+            return phash_image(img)
     except Exception as e:
         logger.warning(f"Failed to compute phash for {path}: {e}")
         return None
 
 
+def sha256_and_phash(path: str | Path) -> tuple[str, Optional[int]]:
+    """
+    Hash an image with SHA256 and phash, raising OSError if it cannot be read.
+
+    Images up to SINGLE_READ_MAX_SIZE are read into memory once, then hashed
+    and decoded from that buffer, so slow storage is only read once. Larger
+    files go through the streaming sha256_file path and are opened again to
+    decode. The phash is None if the image can't be decoded.
+    """
+    with open(path, "rb", buffering=0) as f:
+        data = f.readall() if os.fstat(f.fileno()).st_size <= SINGLE_READ_MAX_SIZE else None
+
+    if data is None:
+        sha256 = sha256_file(path)
+        source: str | Path | io.BytesIO = path
+    else:
+        sha256 = hashlib.sha256(data).hexdigest()
+        source = io.BytesIO(data)
+
+    try:
+        with Image.open(source) as img:
+            phash = phash_image(img)
+    except Exception as e:
+        logger.warning(f"Failed to compute phash for {path}: {e}")
+        phash = None
+    return sha256, phash
+
+
 def get_image_dimensions(path: Path) -> Optional[tuple[int, int]]:
     """Get image dimensions."""
     try:
@@ -50,44 +178,88 @@ def get_image_dimensions(path: Path) -> Optional[tuple[int, int]]:
         return None
 
 
+def _parse_exif_datetime(value: object) -> Optional[str]:
+    """Convert an EXIF "YYYY:MM:DD HH:MM:SS" value to ISO format, or None."""
+    try:
+        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S").isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _exif_date_from_image(img: Image.Image) -> Optional[str]:
+    """Extract the EXIF capture date from an already opened image."""
+    exif = img.getexif()
+    if not exif:
+        return None
+
+    # Check EXIF IFD for DateTimeOriginal first (most accurate)
+    exif_ifd = exif.get_ifd(IFD.Exif)
+    for tag in (Base.DateTimeOriginal, Base.DateTimeDigitized):
+        value = exif_ifd.get(tag)
+        if value is not None:
+            date = _parse_exif_datetime(value)
+            if date:
+                return date
+
+    # Fall back to base EXIF DateTime
+    return _parse_exif_datetime(exif.get(Base.DateTime))
+
+
 def get_exif_date(path: Path) -> Optional[str]:
     """Extract EXIF date from image - handles both JPEG and HEIC/HEIF."""
     try:
         with Image.open(path) as img:
-            exif = img.getexif()
-            if not exif:
-                return None
-
-            # Check EXIF IFD for DateTimeOriginal first (most accurate)
-            exif_ifd = exif.get_ifd(IFD.Exif)
-            if exif_ifd:
-                for tag_id, value in exif_ifd.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    if tag in ("DateTimeOriginal", "DateTimeDigitized"):
-                        try:
-                            dt = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-                            return dt.isoformat()
-                        except ValueError:
-                            pass
-
-            # Fall back to base EXIF DateTime
-            for tag_id, value in exif.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if tag == "DateTime":
-                    try:
-                        dt = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-                        return dt.isoformat()
-                    except ValueError:
-                        pass
+            return _exif_date_from_image(img)
+    except Exception:
+        return None
+
+
+def probe_image(path: Path) -> tuple[Optional[tuple[int, int]], Optional[str]]:
+    """
+    Read dimensions and EXIF date in one open.
+
+    Opening an image (HEIC in particular) is the expensive part of each of
+    these lookups, so they share a single decoder instance.
+
+    Returns (dimensions, exif_date); each is None if unavailable.
+    """
+    dimensions = None
+    exif_date = None
+    try:
+        with Image.open(path) as img:
+            dimensions = img.size
+            try:
+                exif_date = _exif_date_from_image(img)
+            except Exception:
+                pass
     except Exception:
         pass
-    return None
+    return dimensions, exif_date
 
 
-def get_file_date(path: Path) -> Optional[str]:
-    """Get file modification date as fallback."""
+def get_file_date(path: Path, st: Optional[os.stat_result] = None) -> Optional[str]:
+    """Get file modification date as fallback, reusing a stat result if given."""
     try:
-        mtime = os.path.getmtime(path)
+        mtime = st.st_mtime if st is not None else os.path.getmtime(path)
         return datetime.fromtimestamp(mtime).isoformat()
     except OSError:
         return None
+
+
+def parse_date(date: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a date string as produced by get_exif_date/get_file_date.
+
+    Those are ISO 8601, which datetime.fromisoformat handles in C; dateutil's
+    much slower heuristic parser is only used for anything else.
+    """
+    if not date:
+        return None
+    try:
+        return datetime.fromisoformat(date)
+    except ValueError:
+        pass
+    try:
+        return date_parser.parse(date)
+    except (ValueError, OverflowError):
+        return None
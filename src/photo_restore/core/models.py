@@ -1,6 +1,7 @@
 """Data models for photo comparison."""
 
 from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Optional
@@ -16,7 +17,7 @@ class MatchResult(Enum):
     NO_MATCH = "no_match"  # No match found
 
 
-@dataclass
+@dataclass(slots=True)
 class PhotoAsset:
     """Represents a photo or video asset."""
 
@@ -26,11 +27,14 @@ class PhotoAsset:
 
     # Lazily computed fields
     sha256: Optional[str] = None
-    phash: Optional[str] = None
+    phash: Optional[int] = None  # 64-bit perceptual hash
     exif_date: Optional[str] = None
     dimensions: Optional[tuple[int, int]] = None
     duration: Optional[float] = None  # For videos, in seconds
 
+    # Parsed exif_date, cached for date comparisons
+    exif_dt: Optional[datetime] = field(default=None, repr=False)
+
     # iCloud-specific fields
     icloud_uuid: Optional[str] = None
 
@@ -43,7 +47,7 @@ class PhotoAsset:
         return self.path == other.path
 
 
-@dataclass
+@dataclass(slots=True)
 class LivePhoto:
     """Represents a Live Photo (image + video pair)."""
 
@@ -56,7 +60,7 @@ class LivePhoto:
         return self.video_asset is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class ComparisonResult:
     """Result of comparing an Amazon asset against iCloud library."""
 
@@ -77,7 +81,7 @@ class ComparisonResult:
         return self.match_type == MatchResult.UNCERTAIN
 
 
-@dataclass
+@dataclass(slots=True)
 class LivePhotoComparisonResult:
     """Result of comparing a Live Photo pair."""
 
@@ -93,7 +97,7 @@ class LivePhotoComparisonResult:
         return self.image_result.is_missing or self.video_result.is_missing
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingStats:
     """Statistics for the processing run."""
 
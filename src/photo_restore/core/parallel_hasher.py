@@ -1,66 +1,64 @@
 """Parallel hashing utilities for improved performance."""
 
-import hashlib
 import os
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
-import imagehash
 import pillow_heif
 from PIL import Image
 
+from photo_restore.core.constants import IMAGE_EXTENSIONS
+from photo_restore.core.hash_cache import FileKey, HashCache, file_key
+from photo_restore.core.hashing import phash_image, sha256_and_phash, sha256_file
+from photo_restore.core.progress import ProgressThrottle
+
 # Register HEIF/HEIC support
 pillow_heif.register_heif_opener()
 
+# Upper bound on files hashed per worker task
+MAX_CHUNK_SIZE = 64
+
+# Threads per CPU for SHA256-only batches, oversubscribed to overlap file I/O
+SHA256_THREADS_PER_WORKER = 2
+
+
+def _is_image(path: str) -> bool:
+    """Check whether a path has an image extension (and so gets a phash)."""
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
 
 def _compute_sha256(path: str) -> tuple[str, Optional[str]]:
     """Compute SHA256 hash of a file. Returns (path, hash) tuple."""
     try:
-        sha256 = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(65536), b""):
-                sha256.update(chunk)
-        return (path, sha256.hexdigest())
+        return (path, sha256_file(path))
     except (IOError, OSError):
         return (path, None)
 
 
-def _compute_phash(path: str) -> tuple[str, Optional[str]]:
+def _compute_phash(path: str) -> tuple[str, Optional[int]]:
     """Compute perceptual hash of an image. Returns (path, hash) tuple."""
     try:
         with Image.open(path) as img:
-            return (path, str(imagehash.phash(img)))
+            return (path, phash_image(img))
     except Exception:
         return (path, None)
 
 
-def _compute_both_hashes(path: str) -> tuple[str, Optional[str], Optional[str]]:
+def _compute_both_hashes(path: str) -> tuple[str, Optional[str], Optional[int]]:
     """Compute both SHA256 and perceptual hash. Returns (path, sha256, phash) tuple."""
-    sha256 = None
-    phash = None
-
-    # Compute SHA256
     try:
-        sha = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(65536), b""):
-                sha.update(chunk)
-        sha256 = sha.hexdigest()
+        # Images are read once for both hashes
+        if _is_image(path):
+            return (path, *sha256_and_phash(path))
+        return (path, sha256_file(path), None)
     except (IOError, OSError):
-        pass
+        return (path, None, None)
 
-    # Compute phash for images
-    ext = Path(path).suffix.lower()
-    image_exts = {".jpg", ".jpeg", ".heic", ".heif", ".png", ".gif", ".webp", ".tiff", ".tif", ".bmp"}
-    if ext in image_exts:
-        try:
-            with Image.open(path) as img:
-                phash = str(imagehash.phash(img))
-        except Exception:
-            pass
 
-    return (path, sha256, phash)
+def _hash_chunk(func: Callable[[str], tuple], paths: list[str]) -> list[tuple]:
+    """Run a per-file hash function over a chunk of paths in a single worker task."""
+    return [func(path) for path in paths]
 
 
 class ParallelHasher:
@@ -70,6 +68,7 @@ class ParallelHasher:
         self,
         max_workers: Optional[int] = None,
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        cache: Optional[HashCache] = None,
     ):
         """
         Initialize the parallel hasher.
@@ -77,89 +76,151 @@ class ParallelHasher:
         Args:
             max_workers: Maximum number of worker processes. Defaults to CPU count.
             progress_callback: Optional callback(completed, total) for progress updates.
+            cache: Optional persistent cache; unchanged files are not hashed again.
         """
         self.max_workers = max_workers or os.cpu_count() or 4
         self.progress_callback = progress_callback
+        self.cache = cache
 
-    def compute_sha256_batch(self, paths: list[Path]) -> dict[Path, Optional[str]]:
+    def _chunk_size(self, total: int) -> int:
         """
-        Compute SHA256 hashes for a batch of files in parallel.
+        Pick how many files each worker task hashes.
 
-        Returns a dict mapping path -> hash (or None if failed).
+        Small photos hash faster than a task round-trip through the pool, so
+        files are grouped to amortize pickling and queueing, while still
+        leaving several chunks per worker for load balancing.
+        """
+        return max(1, min(MAX_CHUNK_SIZE, total // (self.max_workers * 4)))
+
+    def _lookup_cache(
+        self, paths: list[Path], need_sha256: bool, need_phash: bool
+    ) -> tuple[dict[Path, tuple[Optional[str], Optional[int]]], list[Path], dict[Path, Optional[FileKey]]]:
+        """
+        Split paths into cached hashes and files that still need hashing.
+
+        Returns (cached {path: (sha256, phash)}, paths to hash, file keys to
+        store the new hashes under). Videos never need a phash.
+        """
+        if self.cache is None:
+            return {}, paths, {}
+
+        keys = {path: file_key(path) for path in paths}
+        cached = {
+            path: (sha256, phash)
+            for path, (sha256, phash) in self.cache.get_many(keys).items()
+            if not (need_sha256 and sha256 is None)
+            and not (need_phash and phash is None and _is_image(str(path)))
+        }
+        return cached, [p for p in paths if p not in cached], keys
+
+    def _store_cache(
+        self,
+        keys: dict[Path, Optional[FileKey]],
+        hashes: dict[Path, tuple[Optional[str], Optional[int]]],
+    ) -> None:
+        """Save newly computed (sha256, phash) pairs to the cache, if there is one."""
+        if self.cache is not None:
+            self.cache.put_many({path: (keys[path], *pair) for path, pair in hashes.items()})
+
+    def _run_batch(
+        self,
+        func: Callable[[str], tuple],
+        paths: list[Path],
+        use_threads: bool = False,
+        done: int = 0,
+    ) -> list[Any]:
+        """
+        Run a per-file hash function over all paths, reporting throttled progress per chunk.
+
+        Results come back in the same order as paths, so callers can pair
+        them with the original Path objects instead of rebuilding them.
+
+        With use_threads, chunks run on a thread pool instead of worker
+        processes. That suits work that releases the GIL (file reads and
+        hashlib updates), as it skips process startup and pickling results.
+        Progress counts `done` files (already answered from the cache) as
+        complete from the start.
         """
-        results: dict[Path, Optional[str]] = {}
         path_strs = [str(p) for p in paths]
-        total = len(path_strs)
+        chunk_size = self._chunk_size(len(path_strs))
+        chunks = [path_strs[i : i + chunk_size] for i in range(0, len(path_strs), chunk_size)]
+        total = done + len(path_strs)
+        results: list[Any] = [None] * len(path_strs)
         completed = 0
+        progress = ProgressThrottle(self.progress_callback, total) if self.progress_callback else None
 
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(_compute_sha256, p): p for p in path_strs}
+        if use_threads:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers * SHA256_THREADS_PER_WORKER)
+        else:
+            pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        with pool as executor:
+            futures = {
+                executor.submit(_hash_chunk, func, chunk): i * chunk_size
+                for i, chunk in enumerate(chunks)
+            }
 
             for future in as_completed(futures):
-                path_str, hash_val = future.result()
-                results[Path(path_str)] = hash_val
-                completed += 1
+                chunk_results = future.result()
+                start = futures[future]
+                results[start : start + len(chunk_results)] = chunk_results
+                completed += len(chunk_results)
 
-                if self.progress_callback and completed % 10 == 0:
-                    self.progress_callback(completed, total)
+                if progress and done + completed < total:
+                    progress(done + completed)
 
         if self.progress_callback:
             self.progress_callback(total, total)
 
         return results
 
-    def compute_phash_batch(self, paths: list[Path]) -> dict[Path, Optional[str]]:
+    def compute_sha256_batch(self, paths: list[Path]) -> dict[Path, Optional[str]]:
         """
-        Compute perceptual hashes for a batch of image files in parallel.
+        Compute SHA256 hashes for a batch of files in parallel.
+
+        Runs on threads: file reads and hashlib both release the GIL, so
+        there's no need for worker processes.
 
         Returns a dict mapping path -> hash (or None if failed).
         """
-        results: dict[Path, Optional[str]] = {}
-        path_strs = [str(p) for p in paths]
-        total = len(path_strs)
-        completed = 0
-
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(_compute_phash, p): p for p in path_strs}
-
-            for future in as_completed(futures):
-                path_str, hash_val = future.result()
-                results[Path(path_str)] = hash_val
-                completed += 1
-
-                if self.progress_callback and completed % 10 == 0:
-                    self.progress_callback(completed, total)
-
-        if self.progress_callback:
-            self.progress_callback(total, total)
+        cached, to_hash, keys = self._lookup_cache(paths, need_sha256=True, need_phash=False)
+        hashed = {
+            path: hash_val
+            for path, (_, hash_val) in zip(
+                to_hash, self._run_batch(_compute_sha256, to_hash, use_threads=True, done=len(cached))
+            )
+        }
+        self._store_cache(keys, {path: (sha256, None) for path, sha256 in hashed.items()})
+        return {**{path: sha256 for path, (sha256, _) in cached.items()}, **hashed}
+
+    def compute_phash_batch(self, paths: list[Path]) -> dict[Path, Optional[int]]:
+        """
+        Compute perceptual hashes for a batch of image files in parallel.
 
-        return results
+        Returns a dict mapping path -> hash (or None if failed).
+        """
+        cached, to_hash, keys = self._lookup_cache(paths, need_sha256=False, need_phash=True)
+        hashed = {
+            path: hash_val
+            for path, (_, hash_val) in zip(to_hash, self._run_batch(_compute_phash, to_hash, done=len(cached)))
+        }
+        self._store_cache(keys, {path: (None, phash) for path, phash in hashed.items()})
+        return {**{path: phash for path, (_, phash) in cached.items()}, **hashed}
 
     def compute_all_hashes_batch(
         self, paths: list[Path]
-    ) -> dict[Path, tuple[Optional[str], Optional[str]]]:
+    ) -> dict[Path, tuple[Optional[str], Optional[int]]]:
         """
         Compute both SHA256 and perceptual hashes in parallel.
 
         Returns a dict mapping path -> (sha256, phash).
         """
-        results: dict[Path, tuple[Optional[str], Optional[str]]] = {}
-        path_strs = [str(p) for p in paths]
-        total = len(path_strs)
-        completed = 0
-
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(_compute_both_hashes, p): p for p in path_strs}
-
-            for future in as_completed(futures):
-                path_str, sha256, phash = future.result()
-                results[Path(path_str)] = (sha256, phash)
-                completed += 1
-
-                if self.progress_callback and completed % 10 == 0:
-                    self.progress_callback(completed, total)
-
-        if self.progress_callback:
-            self.progress_callback(total, total)
-
-        return results
+        cached, to_hash, keys = self._lookup_cache(paths, need_sha256=True, need_phash=True)
+        hashed = {
+            path: (sha256, phash)
+            for path, (_, sha256, phash) in zip(
+                to_hash, self._run_batch(_compute_both_hashes, to_hash, done=len(cached))
+            )
+        }
+        self._store_cache(keys, hashed)
+        return {**cached, **hashed}
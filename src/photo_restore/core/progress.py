@@ -0,0 +1,48 @@
+"""Progress reporting utilities."""
+
+import time
+from typing import Callable
+
+# Minimum seconds between progress updates
+PROGRESS_INTERVAL = 0.1
+
+# Progress is also reported after this many equal steps of the total
+PROGRESS_STEPS = 200
+
+
+class ProgressThrottle:
+    """
+    Rate-limit a progress callback(completed, total).
+
+    An update is passed on once at least 1/PROGRESS_STEPS of the total has
+    completed since the last one, or PROGRESS_INTERVAL seconds have passed.
+    The final update (completed == total) is always passed on, so UIs
+    aren't woken for every file of a large batch but still finish at 100%.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[int, int], None],
+        total: int,
+        interval: float = PROGRESS_INTERVAL,
+    ):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.min_step = max(1, total // PROGRESS_STEPS)
+        self._last_completed = 0
+        self._last_time = time.monotonic()
+
+    def __call__(self, completed: int) -> None:
+        """Report progress if enough work or time has passed since the last report."""
+        now = time.monotonic()
+        if (
+            completed < self.total
+            and completed - self._last_completed < self.min_step
+            and now - self._last_time < self.interval
+        ):
+            return
+
+        self._last_completed = completed
+        self._last_time = now
+        self.callback(completed, self.total)
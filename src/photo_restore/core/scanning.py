@@ -0,0 +1,76 @@
+"""Directory scanning utilities."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from photo_restore.core.constants import ALL_EXTENSIONS, SKIPPED_DIRS
+
+# Threads used to list directories concurrently
+SCAN_WORKERS = 8
+
+# Lowercase suffixes for a single str.endswith check per file name
+_MEDIA_SUFFIXES = tuple(ALL_EXTENSIONS)
+
+
+def _list_dir(path: str) -> tuple[list[os.DirEntry], list[str]]:
+    """
+    List one directory, returning (media file entries, subdirectory paths).
+
+    File type checks come from the cached directory entry type instead of a
+    stat call per file, and only names with a media extension are checked.
+    Hidden and system directories (SKIPPED_DIRS) are pruned without being
+    listed. Symlinked directories are not followed and an unreadable
+    directory is treated as empty.
+    """
+    files: list[os.DirEntry] = []
+    subdirs: list[str] = []
+
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return files, subdirs
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith(".") and entry.name not in SKIPPED_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.name.lower().endswith(_MEDIA_SUFFIXES) and entry.is_file():
+                files.append(entry)
+        except OSError:
+            continue
+
+    return files, subdirs
+
+
+def scan_media_entries(folder: Path, max_workers: int = SCAN_WORKERS) -> list[os.DirEntry]:
+    """
+    Recursively list media files under a folder using a pool of threads.
+
+    On network shares and cloud-synced folders each directory listing is
+    dominated by round-trip latency, so every level of the tree is listed
+    concurrently. Entries come back in os.walk order: each folder's files,
+    then its subfolders depth-first in listing order.
+    """
+    root = os.fspath(folder)
+    listings: dict[str, tuple[list[os.DirEntry], list[str]]] = {}
+    level = [root]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while level:
+            next_level: list[str] = []
+            for path, listing in zip(level, executor.map(_list_dir, level)):
+                listings[path] = listing
+                next_level.extend(listing[1])
+            level = next_level
+
+    entries: list[os.DirEntry] = []
+    stack = [root]
+    while stack:
+        files, subdirs = listings[stack.pop()]
+        entries.extend(files)
+        stack.extend(reversed(subdirs))
+
+    return entries
@@ -1,10 +1,14 @@
 """Report generation and file copying."""
 
+import ctypes
 import json
+import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 from photo_restore.core.models import (
     ComparisonResult,
@@ -13,6 +17,67 @@ from photo_restore.core.models import (
     ProcessingStats,
 )
 
+if sys.platform.startswith("linux"):
+    import fcntl
+
+# Concurrent copies when staging a batch of files
+COPY_WORKERS = 8
+
+# (source, destination, for review) of a file to stage
+StagedCopy = tuple[Path, Path, bool]
+
+# Linux ioctl that reflinks one file's extents into another (FICLONE)
+_FICLONE = 0x40049409
+
+# macOS APFS copy-on-write clone, None where unavailable
+_clonefile = None
+if sys.platform == "darwin":
+    try:
+        _clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        _clonefile.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _clonefile = None
+
+
+def _clone_file(src: Path, dest: Path) -> bool:
+    """Try to create dest as a copy-on-write clone of src, returning False if unsupported."""
+    if _clonefile is not None:
+        return _clonefile(os.fsencode(src), os.fsencode(dest), 0) == 0
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            return False
+
+    return False
+
+
+def copy_file(src: Path, dest: Path) -> None:
+    """
+    Copy a file with its metadata, like shutil.copy2.
+
+    On filesystems with copy-on-write clones (APFS, Btrfs, XFS) the copy
+    shares the source's data blocks, so staging is a metadata operation.
+    Elsewhere shutil.copy2 is used, which copies in the kernel where it can.
+    """
+    if _clone_file(src, dest):
+        shutil.copystat(src, dest)
+    else:
+        shutil.copy2(src, dest)
+
+
+def _try_copy(src: Path, dest: Path) -> Optional[OSError]:
+    """Copy a file, returning the error instead of raising it."""
+    try:
+        copy_file(src, dest)
+    except OSError as e:
+        return e
+    return None
+
 
 class Reporter:
     """Handles report generation and file staging."""
@@ -27,21 +92,61 @@ class Reporter:
         self.dry_run = dry_run
         self.verbose = verbose
         self.stats = ProcessingStats()
-        self.log_entries: list[dict] = []
+        # One log per run, so runs sharing an output folder don't mix entries
+        self.log_path = self.output_folder / f"processing_log_{datetime.now():%Y%m%d_%H%M%S}.ndjson"
+        self._log_file: Optional[TextIO] = None
+        # Dry-run entries held until the report is written, so nothing is created before then
+        self._pending_log: list[str] = []
+        # Next collision suffix to try per (folder, file name)
+        self._name_counters: dict[tuple[Path, str], int] = {}
+        # Destinations handed out this run, taken even before anything is written
+        self._reserved: set[Path] = set()
 
     def _log(self, message: str, level: str = "info") -> None:
-        """Log message and store in log entries."""
+        """
+        Log message and append it to the processing log.
+
+        Entries are streamed to log_path as one JSON object per line rather
+        than kept in memory, so a large run's log doesn't grow with the
+        number of files copied. Dry runs create nothing on disk until
+        generate_report, so their entries wait in memory until then.
+        """
         entry = {
             "timestamp": datetime.now().isoformat(),
             "level": level,
             "message": message,
         }
-        self.log_entries.append(entry)
+        line = json.dumps(entry) + "\n"
+        if self.dry_run and self._log_file is None:
+            self._pending_log.append(line)
+        else:
+            self._open_log().write(line)
 
         if self.verbose:
             prefix = {"info": "[INFO]", "warn": "[WARN]", "error": "[ERROR]"}
             print(f"{prefix.get(level, '[LOG]')} {message}")
 
+    def _open_log(self) -> TextIO:
+        """
+        Open this run's processing log on first use.
+
+        The file is created exclusively; if another run started in the same
+        second, a _N suffix is added and log_path updated to match.
+        """
+        if self._log_file is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            base = self.log_path
+            counter = 0
+            while self._log_file is None:
+                try:
+                    self._log_file = open(self.log_path, "x", encoding="utf-8")
+                except FileExistsError:
+                    counter += 1
+                    self.log_path = base.with_name(f"{base.stem}_{counter}{base.suffix}")
+            self._log_file.writelines(self._pending_log)
+            self._pending_log.clear()
+        return self._log_file
+
     def setup_output_folder(self) -> None:
         """Create output folder structure."""
         if self.dry_run:
@@ -53,59 +158,76 @@ class Reporter:
         (self.output_folder / "uncertain").mkdir(exist_ok=True)
         self._log(f"Created output folder: {self.output_folder}")
 
-    def copy_missing_file(self, result: ComparisonResult) -> bool:
-        """Copy a missing file to the staging folder."""
-        src = result.amazon_asset.path
-        dest_folder = self.output_folder / "missing"
-        dest = dest_folder / src.name
-
-        # Handle filename conflicts
-        counter = 1
-        while dest.exists():
-            stem = src.stem
-            suffix = src.suffix
-            dest = dest_folder / f"{stem}_{counter}{suffix}"
+    def _unique_dest(self, dest_folder: Path, src: Path) -> Path:
+        """
+        Pick a destination for src in dest_folder that isn't taken yet.
+
+        Name conflicts get a _N suffix. A name is taken if it exists on disk
+        or was already handed out this run, since a batch is planned before
+        any of it is copied; this also keeps a real "IMG_1_1.jpg" from
+        colliding with the suffixed second "IMG_1.jpg". The next N is
+        remembered per name, so staging many files with the same name
+        doesn't re-check every earlier candidate.
+        """
+        key = (dest_folder, src.name)
+        counter = self._name_counters.get(key, 0)
+        dest = dest_folder / src.name if counter == 0 else dest_folder / f"{src.stem}_{counter}{src.suffix}"
+        while dest in self._reserved or dest.exists():
             counter += 1
+            dest = dest_folder / f"{src.stem}_{counter}{src.suffix}"
+        self._name_counters[key] = counter + 1
+        self._reserved.add(dest)
+        return dest
 
+    def _plan_copy(self, result: ComparisonResult, for_review: bool) -> StagedCopy:
+        """Choose where a result's Amazon file is staged: missing/, or uncertain/ for review."""
+        src = result.amazon_asset.path
+        dest_folder = self.output_folder / ("uncertain" if for_review else "missing")
+        return src, self._unique_dest(dest_folder, src), for_review
+
+    def _copy_planned(self, copies: list[StagedCopy]) -> list[bool]:
+        """
+        Copy planned (src, dest, for_review) files, returning which succeeded.
+
+        Copying is mostly waiting on storage, so batches run on a thread pool
+        to keep several copies in flight. Every planned destination was
+        reserved by _unique_dest, so no two copies write the same file.
+        Outcomes are logged in order once the copies finish.
+        """
         if self.dry_run:
-            self._log(f"[DRY RUN] Would copy: {src} -> {dest}")
-            return True
+            for src, dest, for_review in copies:
+                action = "Would copy for review" if for_review else "Would copy"
+                self._log(f"[DRY RUN] {action}: {src} -> {dest}")
+            return [True] * len(copies)
+
+        if len(copies) > 1:
+            with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+                errors = list(executor.map(_try_copy, [c[0] for c in copies], [c[1] for c in copies]))
+        else:
+            errors = [_try_copy(src, dest) for src, dest, _ in copies]
+
+        copied = []
+        for (src, dest, for_review), error in zip(copies, errors):
+            if error is None:
+                action = "Copied for review" if for_review else "Copied"
+                self._log(f"{action}: {src} -> {dest}")
+            else:
+                self._log(f"Failed to copy {src}: {error}", level="error")
+                self.stats.errors += 1
+            copied.append(error is None)
+        return copied
 
-        try:
-            shutil.copy2(src, dest)
-            self._log(f"Copied: {src} -> {dest}")
-            return True
-        except (IOError, OSError) as e:
-            self._log(f"Failed to copy {src}: {e}", level="error")
-            self.stats.errors += 1
-            return False
+    def copy_missing_file(self, result: ComparisonResult) -> bool:
+        """Copy a missing file to the staging folder."""
+        return self._copy_planned([self._plan_copy(result, for_review=False)])[0]
+
+    def copy_missing_files(self, results: list[ComparisonResult]) -> list[bool]:
+        """Copy a batch of missing files to the staging folder concurrently, returning which succeeded."""
+        return self._copy_planned([self._plan_copy(result, for_review=False) for result in results])
 
     def copy_uncertain_file(self, result: ComparisonResult) -> bool:
         """Copy an uncertain match file for review."""
-        src = result.amazon_asset.path
-        dest_folder = self.output_folder / "uncertain"
-        dest = dest_folder / src.name
-
-        # Handle filename conflicts
-        counter = 1
-        while dest.exists():
-            stem = src.stem
-            suffix = src.suffix
-            dest = dest_folder / f"{stem}_{counter}{suffix}"
-            counter += 1
-
-        if self.dry_run:
-            self._log(f"[DRY RUN] Would copy for review: {src} -> {dest}")
-            return True
-
-        try:
-            shutil.copy2(src, dest)
-            self._log(f"Copied for review: {src} -> {dest}")
-            return True
-        except (IOError, OSError) as e:
-            self._log(f"Failed to copy {src}: {e}", level="error")
-            self.stats.errors += 1
-            return False
+        return self._copy_planned([self._plan_copy(result, for_review=True)])[0]
 
     def process_results(
         self,
@@ -114,15 +236,16 @@ class Reporter:
     ) -> None:
         """Process all comparison results and copy files as needed."""
         self.setup_output_folder()
+        copies: list[StagedCopy] = []
 
         # Process regular photo results
         for result in results:
             self._update_stats(result)
 
             if result.is_missing:
-                self.copy_missing_file(result)
+                copies.append(self._plan_copy(result, for_review=False))
             elif result.needs_review:
-                self.copy_uncertain_file(result)
+                copies.append(self._plan_copy(result, for_review=True))
 
         # Process Live Photo results
         for live_result in live_results:
@@ -130,18 +253,20 @@ class Reporter:
 
             # Check image component
             if live_result.image_result.is_missing:
-                self.copy_missing_file(live_result.image_result)
+                copies.append(self._plan_copy(live_result.image_result, for_review=False))
                 self.stats.missing_files += 1
             elif live_result.image_result.needs_review:
-                self.copy_uncertain_file(live_result.image_result)
+                copies.append(self._plan_copy(live_result.image_result, for_review=True))
 
             # Check video component
             if live_result.video_result:
                 if live_result.video_result.is_missing:
-                    self.copy_missing_file(live_result.video_result)
+                    copies.append(self._plan_copy(live_result.video_result, for_review=False))
                     self.stats.missing_files += 1
                 elif live_result.video_result.needs_review:
-                    self.copy_uncertain_file(live_result.video_result)
+                    copies.append(self._plan_copy(live_result.video_result, for_review=True))
+
+        self._copy_planned(copies)
 
     def _update_stats(self, result: ComparisonResult) -> None:
         """Update statistics based on comparison result."""
@@ -193,17 +318,15 @@ class Reporter:
         amazon_folder: Path,
     ) -> Path:
         """Generate the final JSON report."""
-        # Collect missing files
-        missing = [
-            self._result_to_dict(r) for r in results if r.match_type == MatchResult.NO_MATCH
-        ]
-
-        # Collect uncertain matches
-        uncertain = [
-            self._result_to_dict(r)
-            for r in results
-            if r.match_type == MatchResult.UNCERTAIN
-        ]
+        # Collect missing files and uncertain matches in one pass
+        missing = []
+        uncertain = []
+        for r in results:
+            match_type = r.match_type
+            if match_type == MatchResult.NO_MATCH:
+                missing.append(self._result_to_dict(r))
+            elif match_type == MatchResult.UNCERTAIN:
+                uncertain.append(self._result_to_dict(r))
 
         # Collect Live Photo issues
         live_photo_missing = []
@@ -218,6 +341,9 @@ class Reporter:
             ):
                 live_photo_uncertain.append(self._live_result_to_dict(lr))
 
+        # Fixes log_path before the report refers to it, writing any held dry-run entries
+        self._open_log()
+
         report = {
             "generated_at": datetime.now().isoformat(),
             "amazon_folder": str(amazon_folder),
@@ -227,7 +353,7 @@ class Reporter:
             "uncertain_matches": uncertain,
             "live_photo_missing": live_photo_missing,
             "live_photo_uncertain": live_photo_uncertain,
-            "processing_log": self.log_entries,
+            "processing_log": str(self.log_path),
         }
 
         report_path = self.output_folder / "report.json"
@@ -241,8 +367,16 @@ class Reporter:
             json.dump(report, f, indent=2)
 
         self._log(f"Report written to: {report_path}")
+        if self._log_file is not None:
+            self._log_file.flush()
         return report_path
 
+    def close(self) -> None:
+        """Close the processing log."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
     def print_summary(self) -> None:
         """Print a summary of the processing results."""
         print("\n" + "=" * 50)
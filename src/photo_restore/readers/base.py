@@ -5,25 +5,38 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Callable, Iterator, Optional
 
-from photo_restore.core.constants import ALL_EXTENSIONS, VIDEO_EXTENSIONS
+from photo_restore.core.constants import VIDEO_EXTENSIONS
+from photo_restore.core.hash_cache import HashCache
 from photo_restore.core.hashing import (
     compute_phash,
     compute_sha256,
-    get_exif_date,
     get_file_date,
-    get_image_dimensions,
+    parse_date,
+    probe_image,
+    sha256_and_phash,
 )
 from photo_restore.core.models import LivePhoto, PhotoAsset
 from photo_restore.core.parallel_hasher import ParallelHasher
+from photo_restore.core.scanning import scan_media_entries
+
+
+def _split_name(name: str) -> tuple[str, str]:
+    """Split a file name into (uppercase basename, lowercase extension)."""
+    stem, ext = os.path.splitext(name)
+    return stem.upper(), ext.lower()
 
 
 class BaseReader(ABC):
     """Abstract base class for photo folder readers."""
 
-    def __init__(self, folder: Path, verbose: bool = False):
+    def __init__(self, folder: Path, verbose: bool = False, hash_cache: Optional[HashCache] = None):
         self.folder = Path(folder)
         self.verbose = verbose
+        self.hash_cache = hash_cache
         self._all_files: Optional[list[Path]] = None
+        self._processing_files: Optional[list[Path]] = None
+        self._file_stats: dict[Path, os.stat_result] = {}
+        self._name_keys: dict[Path, tuple[str, str]] = {}
 
     @property
     @abstractmethod
@@ -44,33 +57,45 @@ class BaseReader(ABC):
         self._log(f"Scanning folder: {self.folder}")
         files = []
 
-        for root, _, filenames in os.walk(self.folder):
-            for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                if ext in ALL_EXTENSIONS:
-                    files.append(Path(root) / filename)
+        for entry in scan_media_entries(self.folder):
+            path = Path(entry.path)
+            self._name_keys[path] = _split_name(entry.name)
+            # Keep the scan's stat so assets don't stat each file again
+            try:
+                self._file_stats[path] = entry.stat()
+            except OSError:
+                pass
+            files.append(path)
 
         self._log(f"Found {len(files)} media files")
         self._all_files = files
         return files
 
+    def _name_key(self, path: Path) -> tuple[str, str]:
+        """Get (uppercase basename, lowercase extension), split once per scanned file."""
+        key = self._name_keys.get(path)
+        if key is None:
+            key = self._name_keys[path] = _split_name(path.name)
+        return key
+
     def _create_asset(self, path: Path) -> Optional[PhotoAsset]:
         """Create a PhotoAsset from a file path."""
         try:
-            file_size = path.stat().st_size
+            st = self._file_stats.get(path) or path.stat()
         except OSError:
             return None
+        file_size = st.st_size
 
-        ext = path.suffix.lower()
+        _, ext = self._name_key(path)
         is_video = ext in VIDEO_EXTENSIONS
 
         # Get EXIF date for images, file date for videos
         if is_video:
-            exif_date = get_file_date(path)
+            exif_date = get_file_date(path, st)
             dimensions = None
         else:
-            exif_date = get_exif_date(path) or get_file_date(path)
-            dimensions = get_image_dimensions(path)
+            dimensions, exif_date = probe_image(path)
+            exif_date = exif_date or get_file_date(path, st)
 
         return PhotoAsset(
             path=path,
@@ -78,11 +103,18 @@ class BaseReader(ABC):
             is_video=is_video,
             exif_date=exif_date,
             dimensions=dimensions,
+            exif_dt=parse_date(exif_date),
         )
 
+    def _filter_files(self, files: list[Path]) -> list[Path]:
+        """Filter scanned files before processing. Subclasses can override."""
+        return files
+
     def _get_files_for_processing(self) -> list[Path]:
-        """Get files for processing. Subclasses can override to filter."""
-        return self._scan_files()
+        """Get filtered files for processing, computed once per reader."""
+        if self._processing_files is None:
+            self._processing_files = self._filter_files(self._scan_files())
+        return self._processing_files
 
     def get_photos(self) -> Iterator[PhotoAsset]:
         """Get all photos/videos from the folder."""
@@ -105,8 +137,7 @@ class BaseReader(ABC):
         # Group by base filename to find pairs
         by_basename: dict[str, dict[str, Path]] = {}
         for f in files:
-            basename = f.stem.upper()
-            ext = f.suffix.lower()
+            basename, ext = self._name_key(f)
             if basename not in by_basename:
                 by_basename[basename] = {}
             by_basename[basename][ext] = f
@@ -143,6 +174,15 @@ class BaseReader(ABC):
 
     def compute_hashes_for_asset(self, asset: PhotoAsset) -> PhotoAsset:
         """Compute SHA256 and perceptual hash for an asset."""
+        if asset.sha256 is None and asset.phash is None and not asset.is_video:
+            # Read the file once for both hashes; on failure fall through so
+            # each hash reports its own error
+            try:
+                asset.sha256, asset.phash = sha256_and_phash(asset.path)
+                return asset
+            except OSError:
+                pass
+
         if asset.sha256 is None:
             asset.sha256 = compute_sha256(asset.path)
 
@@ -172,7 +212,7 @@ class BaseReader(ABC):
             if progress_callback:
                 progress_callback(completed, total, f"Hashing {completed}/{total} files...")
 
-        hasher = ParallelHasher(progress_callback=on_progress)
+        hasher = ParallelHasher(progress_callback=on_progress, cache=self.hash_cache)
 
         if compute_phash:
             # Compute both hashes together
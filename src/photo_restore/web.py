@@ -8,66 +8,99 @@ NiceGUI-based web interface for comparing photo folders.
 import asyncio
 import os
 import sys
+import traceback
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from string import ascii_uppercase
 from typing import Callable, Optional
 
-from nicegui import ui, app
+from nicegui import app, background_tasks, run, ui
 
 from photo_restore.comparison import PhotoComparator, LivePhotoHandler
 from photo_restore.core import (
-    ALL_EXTENSIONS,
     IMAGE_EXTENSIONS,
     VIDEO_EXTENSIONS,
     ComparisonResult,
     MatchResult,
     ProcessingStats,
+    open_hash_cache,
+    scan_media_entries,
 )
 from photo_restore.output import Reporter
 from photo_restore.readers import AmazonReader, ICloudReader
 
+# Missing files copied per step of an export, between progress updates
+EXPORT_BATCH_SIZE = 50
+
+# Rows per page in the missing and uncertain results tables
+RESULTS_PAGE_SIZE = 20
+
 
 def count_media_files(folder_path: str) -> dict:
-    """Count media files in a folder, returning counts by type."""
+    """
+    Count media files in a folder, returning counts by type.
+
+    Counts are cached per resolved folder and its modification time, so
+    re-focusing or re-selecting the same folder doesn't walk it again. Only
+    the top-level folder's mtime is checked, so changes made deep inside
+    subfolders show up once the top-level folder changes or the app restarts.
+    A folder that can't be listed yet (a pending privacy prompt, an offline
+    share) counts as empty without being cached.
+    """
     try:
-        path = Path(folder_path).expanduser()
-        if not path.exists() or not path.is_dir():
+        path = Path(folder_path).expanduser().resolve()
+        if not path.is_dir():
             return {"photos": 0, "videos": 0, "live_photos": 0, "total": 0}
-
-        photos = 0
-        videos = 0
-        files_by_stem: dict[str, set[str]] = {}
-
-        for root, _, filenames in os.walk(path):
-            for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                stem = Path(filename).stem.upper()
-
-                if ext in IMAGE_EXTENSIONS:
-                    photos += 1
-                    if stem not in files_by_stem:
-                        files_by_stem[stem] = set()
-                    files_by_stem[stem].add("image")
-                elif ext in VIDEO_EXTENSIONS:
-                    videos += 1
-                    if stem not in files_by_stem:
-                        files_by_stem[stem] = set()
-                    files_by_stem[stem].add("video")
-
-        # Count Live Photos (image + video with same stem)
-        live_photos = sum(1 for exts in files_by_stem.values() if "image" in exts and "video" in exts)
-
-        return {
-            "photos": photos,
-            "videos": videos,
-            "live_photos": live_photos,
-            "total": photos + videos,
-        }
+        # The scanner treats an unreadable folder as empty, so check the root here
+        with os.scandir(path):
+            pass
+        return dict(_count_media_files(path, path.stat().st_mtime_ns))
     except Exception:
         return {"photos": 0, "videos": 0, "live_photos": 0, "total": 0}
 
 
+@lru_cache(maxsize=32)
+def _count_media_files(path: Path, mtime_ns: int) -> dict:
+    """Walk a folder and count its media files; mtime_ns only keys the cache."""
+    photos = 0
+    videos = 0
+    image_stems: set[str] = set()
+    video_stems: set[str] = set()
+
+    # Same scandir-based listing the readers use, already filtered to media files
+    for entry in scan_media_entries(path):
+        stem, ext = os.path.splitext(entry.name)
+        ext = ext.lower()
+
+        if ext in IMAGE_EXTENSIONS:
+            photos += 1
+            image_stems.add(stem.upper())
+        elif ext in VIDEO_EXTENSIONS:
+            videos += 1
+            video_stems.add(stem.upper())
+
+    # Count Live Photos (image + video with same stem)
+    live_photos = len(image_stems & video_stems)
+
+    return {
+        "photos": photos,
+        "videos": videos,
+        "live_photos": live_photos,
+        "total": photos + videos,
+    }
+
+
+@lru_cache(maxsize=64)
+def _list_folders(path: Path, mtime_ns: int) -> tuple[Path, ...]:
+    """List a folder's visible subfolders by name; mtime_ns only keys the cache."""
+    # scandir entries answer is_dir() from the directory listing, without a stat per item
+    with os.scandir(path) as it:
+        entries = [e for e in it if not e.name.startswith(".") and e.is_dir()]
+    entries.sort(key=lambda e: e.name)
+    return tuple(Path(e.path) for e in entries)
+
+
 class FolderBrowser:
     """A folder browser dialog component."""
 
@@ -80,13 +113,15 @@ class FolderBrowser:
         self.path_display: Optional[ui.label] = None
 
     def get_folders(self, path: Path) -> list[Path]:
-        """Get list of folders in the given path."""
+        """
+        Get list of folders in the given path.
+
+        Listings are cached per folder and modification time, so going up
+        with ".." and back into a folder doesn't scan it again. Creating or
+        removing a subfolder changes the mtime and refreshes the listing.
+        """
         try:
-            folders = []
-            for item in sorted(path.iterdir()):
-                if item.is_dir() and not item.name.startswith("."):
-                    folders.append(item)
-            return folders
+            return list(_list_folders(path, path.stat().st_mtime_ns))
         except PermissionError:
             return []
 
@@ -208,8 +243,12 @@ class PhotoRestoreApp:
         self.comparison_done: bool = False
         self.stats: Optional[ProcessingStats] = None
         self.results: list[ComparisonResult] = []
+        self.missing_results: list[ComparisonResult] = []  # NO_MATCH subset of results
+        self.uncertain_results: list[ComparisonResult] = []  # UNCERTAIN subset of results
         self.live_results: list = []  # LivePhotoComparisonResult list
         self.log_messages: list[str] = []
+        # Latest hashing progress, written by the hashing thread and polled by a bound label
+        self.progress_text: str = ""
 
         # Folder counts
         self.amazon_counts: dict = {"photos": 0, "videos": 0, "live_photos": 0, "total": 0}
@@ -227,9 +266,7 @@ class PhotoRestoreApp:
     @property
     def missing_count(self) -> int:
         """Count of missing files from last comparison."""
-        if not self.results:
-            return 0
-        return sum(1 for r in self.results if r.match_type == MatchResult.NO_MATCH)
+        return len(self.missing_results)
 
 
 # Global app state
@@ -269,9 +306,13 @@ def create_folder_input_with_browse(
         if show_counts:
             stats_label = ui.label("").classes("text-caption text-grey")
 
-        def update_counts(path: str):
+        async def update_counts(path: str):
             if show_counts and stats_label and count_attr:
-                counts = count_media_files(path)
+                # Walking a large or network folder would otherwise freeze the page
+                counts = await run.io_bound(count_media_files, path)
+                # A slower count for a previously chosen folder must not overwrite the current one
+                if path != folder_input.value:
+                    return
                 setattr(app_state, count_attr, counts)
                 if counts["total"] > 0:
                     stats_label.set_text(
@@ -285,7 +326,7 @@ def create_folder_input_with_browse(
         def on_folder_selected(path: str):
             setattr(app_state, bind_attr, path)
             folder_input.value = path
-            update_counts(path)
+            background_tasks.create(update_counts(path))
 
         def open_browser():
             browser = FolderBrowser(
@@ -430,6 +471,8 @@ async def run_comparison(log_area, results_container, stats_container):
 
     # Clear previous results
     app_state.results.clear()
+    app_state.missing_results.clear()
+    app_state.uncertain_results.clear()
     app_state.live_results.clear()
     app_state.stats = None
     app_state.comparison_done = False
@@ -439,11 +482,19 @@ async def run_comparison(log_area, results_container, stats_container):
     app_state.clear_log()  # Keep app_state in sync
 
     app_state.is_running = True
+    hash_cache = open_hash_cache()
+    reporter: Optional[Reporter] = None
 
     def log(msg: str):
         app_state.log(msg)  # Persist with timestamp
         log_area.push(app_state.log_messages[-1])  # Display formatted message
 
+    loop = asyncio.get_running_loop()
+
+    def log_from_thread(msg: str):
+        # UI elements may only be touched on the event loop
+        loop.call_soon_threadsafe(log, msg)
+
     try:
         log("Starting photo comparison...")
         log(f"Amazon folder: {amazon_path}")
@@ -454,42 +505,30 @@ async def run_comparison(log_area, results_container, stats_container):
         # Initialize reporter (dry_run=True for comparison, export later)
         reporter = Reporter(output_path, dry_run=True, verbose=True)
 
-        # Load Amazon photos
-        log("Loading Amazon Photos...")
-        await asyncio.sleep(0.1)  # Allow UI to update
-        amazon_reader = AmazonReader(amazon_path, verbose=False)
-        amazon_photos, amazon_live_photos = amazon_reader.load_all()
+        amazon_reader = AmazonReader(amazon_path, verbose=False, hash_cache=hash_cache)
+        icloud_reader = ICloudReader(icloud_path, verbose=False, hash_cache=hash_cache)
+
+        # Both folders load concurrently. Exceptions are collected rather than
+        # raised so neither load is still running once a failure is reported.
+        log("Loading Amazon and iCloud Photos...")
+        amazon_loaded, icloud_loaded = await asyncio.gather(
+            run.io_bound(amazon_reader.load_all),
+            run.io_bound(icloud_reader.load_all),
+            return_exceptions=True,
+        )
+        for loaded in (amazon_loaded, icloud_loaded):
+            if isinstance(loaded, BaseException):
+                raise loaded
+
+        amazon_photos, amazon_live_photos = amazon_loaded
         reporter.stats.total_amazon_files = len(amazon_photos)
+        log("Amazon Photos:")
         log(f"  Found {len(amazon_photos)} photos/videos")
         log(f"  Found {len(amazon_live_photos)} Live Photo pairs")
 
-        # Compute hashes for Amazon photos using parallel processing
-        log("")
-        log(f"Computing hashes for Amazon photos (using {os.cpu_count() or 4} CPU cores)...")
-
-        hash_progress = {"last_log": 0}
-
-        def amazon_hash_progress(completed: int, total: int, msg: str) -> None:
-            # Log every 10% or at least every 50 files
-            if completed - hash_progress["last_log"] >= max(total // 10, 50) or completed == total:
-                log(f"  {msg}")
-                hash_progress["last_log"] = completed
-
-        # Use parallel hashing - compute only SHA256 upfront, phash lazily
-        amazon_reader.compute_hashes_parallel(
-            amazon_photos,
-            progress_callback=amazon_hash_progress,
-            compute_phash=False,  # Lazy phash - compute only when needed
-        )
-        log(f"  Completed {len(amazon_photos)} files")
-
-        # Load iCloud photos
-        log("")
-        log("Loading iCloud Photos...")
-        await asyncio.sleep(0.1)
-        icloud_reader = ICloudReader(icloud_path, verbose=False)
-        icloud_photos, icloud_live_photos = icloud_reader.load_all()
+        icloud_photos, icloud_live_photos = icloud_loaded
         reporter.stats.total_icloud_files = len(icloud_photos)
+        log("iCloud Photos:")
         log(f"  Found {len(icloud_photos)} photos/videos")
         log(f"  Found {len(icloud_live_photos)} Live Photo pairs")
 
@@ -497,26 +536,25 @@ async def run_comparison(log_area, results_container, stats_container):
         log("")
         log(f"Computing hashes for iCloud photos (using {os.cpu_count() or 4} CPU cores)...")
 
-        hash_progress["last_log"] = 0
+        hash_progress = {"last_log": 0}
 
         def icloud_hash_progress(completed: int, total: int, msg: str) -> None:
+            app_state.progress_text = msg
             if completed - hash_progress["last_log"] >= max(total // 10, 50) or completed == total:
-                log(f"  {msg}")
+                log_from_thread(f"  {msg}")
                 hash_progress["last_log"] = completed
 
+        # Hashing runs off the event loop, so the UI stays live and shows progress
         # iCloud photos need phash computed upfront for indexing
-        icloud_reader.compute_hashes_parallel(
+        await run.io_bound(
+            icloud_reader.compute_hashes_parallel,
             icloud_photos,
             progress_callback=icloud_hash_progress,
             compute_phash=True,  # Need phash for index
         )
+        app_state.progress_text = ""
         log(f"  Completed {len(icloud_photos)} files")
 
-        # Compare photos with lazy perceptual hashing
-        log("")
-        log("Comparing photos (with lazy perceptual hashing)...")
-        await asyncio.sleep(0.1)
-
         compare_progress = {"last_log": 0, "phash_count": 0}
 
         def on_phash_compute(msg: str) -> None:
@@ -524,11 +562,6 @@ async def run_comparison(log_area, results_container, stats_container):
             if compare_progress["phash_count"] % 20 == 0:
                 log(f"  Computing lazy phash #{compare_progress['phash_count']}...")
 
-        def on_compare_progress(completed: int, total: int) -> None:
-            if completed - compare_progress["last_log"] >= max(total // 10, 50) or completed == total:
-                log(f"  Compared {completed}/{total} files...")
-                compare_progress["last_log"] = completed
-
         comparator = PhotoComparator(
             icloud_photos,
             perceptual_threshold=int(app_state.perceptual_threshold),
@@ -536,6 +569,42 @@ async def run_comparison(log_area, results_container, stats_container):
             lazy_phash=True,  # Only compute phash when needed
             phash_callback=on_phash_compute,
         )
+
+        # Compute hashes for Amazon photos using parallel processing
+        # Only files with the same size as an iCloud file can match exactly
+        amazon_to_hash = [p for p in amazon_photos if comparator.needs_sha256(p)]
+        log("")
+        log(f"Computing hashes for {len(amazon_to_hash)} Amazon photos (using {os.cpu_count() or 4} CPU cores)...")
+
+        hash_progress["last_log"] = 0
+
+        def amazon_hash_progress(completed: int, total: int, msg: str) -> None:
+            app_state.progress_text = msg
+            # Log every 10% or at least every 50 files
+            if completed - hash_progress["last_log"] >= max(total // 10, 50) or completed == total:
+                log_from_thread(f"  {msg}")
+                hash_progress["last_log"] = completed
+
+        # Use parallel hashing - compute only SHA256 upfront, phash lazily
+        await run.io_bound(
+            amazon_reader.compute_hashes_parallel,
+            amazon_to_hash,
+            progress_callback=amazon_hash_progress,
+            compute_phash=False,  # Lazy phash - compute only when needed
+        )
+        app_state.progress_text = ""
+        log(f"  Completed {len(amazon_to_hash)} files")
+
+        # Compare photos with lazy perceptual hashing
+        log("")
+        log("Comparing photos (with lazy perceptual hashing)...")
+        await asyncio.sleep(0.1)
+
+        def on_compare_progress(completed: int, total: int) -> None:
+            if completed - compare_progress["last_log"] >= max(total // 10, 50) or completed == total:
+                log(f"  Compared {completed}/{total} files...")
+                compare_progress["last_log"] = completed
+
         results = comparator.compare_all(amazon_photos, progress_callback=on_compare_progress)
         log(f"  Compared {len(results)} files")
         if compare_progress["phash_count"] > 0:
@@ -563,13 +632,23 @@ async def run_comparison(log_area, results_container, stats_container):
 
         # Store results for later export
         app_state.results = results
+        # Split once; the results display and export both read these lists
+        missing: list[ComparisonResult] = []
+        uncertain: list[ComparisonResult] = []
+        for result in results:
+            if result.match_type == MatchResult.NO_MATCH:
+                missing.append(result)
+            elif result.match_type == MatchResult.UNCERTAIN:
+                uncertain.append(result)
+        app_state.missing_results = missing
+        app_state.uncertain_results = uncertain
         app_state.live_results = live_results
         app_state.stats = reporter.stats
         app_state.comparison_done = True
 
         # Update UI with results
         update_stats_display(stats_container, reporter.stats)
-        update_results_display(results_container, results)
+        update_results_display(results_container, missing, uncertain)
 
         log("")
         log("=" * 50)
@@ -583,11 +662,15 @@ async def run_comparison(log_area, results_container, stats_container):
     except Exception as e:
         log(f"ERROR: {e}")
         ui.notify(f"Error: {e}", type="negative")
-        import traceback
         log(traceback.format_exc())
 
     finally:
         app_state.is_running = False
+        app_state.progress_text = ""
+        if reporter:
+            reporter.close()
+        if hash_cache:
+            hash_cache.close()
 
 
 async def export_missing_files(log_area):
@@ -603,6 +686,7 @@ async def export_missing_files(log_area):
     output_path = Path(app_state.output_folder).expanduser()
 
     app_state.is_exporting = True
+    reporter: Optional[Reporter] = None
 
     def log(msg: str):
         app_state.log(msg)  # Persist with timestamp
@@ -620,32 +704,27 @@ async def export_missing_files(log_area):
         reporter.setup_output_folder()
 
         # Export missing files from comparison results
-        missing_results = [r for r in app_state.results if r.match_type == MatchResult.NO_MATCH]
+        missing_results = app_state.missing_results
         exported = 0
         errors = 0
 
         log(f"Exporting {len(missing_results)} missing files...")
-        await asyncio.sleep(0.1)
 
-        for i, result in enumerate(missing_results):
-            if i % 10 == 0:
-                log(f"  Copying {i+1}/{len(missing_results)}...")
-                await asyncio.sleep(0.01)
-
-            if reporter.copy_missing_file(result):
-                exported += 1
-            else:
-                errors += 1
+        # Each batch is copied concurrently off the event loop, with progress between batches
+        for i in range(0, len(missing_results), EXPORT_BATCH_SIZE):
+            log(f"  Copying {i+1}/{len(missing_results)}...")
+            copied = await run.io_bound(reporter.copy_missing_files, missing_results[i : i + EXPORT_BATCH_SIZE])
+            exported += sum(copied)
+            errors += len(copied) - sum(copied)
 
         # Export missing Live Photo components
-        live_missing = 0
+        live_components = []
         for live_result in app_state.live_results:
             if live_result.image_result.is_missing:
-                if reporter.copy_missing_file(live_result.image_result):
-                    live_missing += 1
+                live_components.append(live_result.image_result)
             if live_result.video_result and live_result.video_result.is_missing:
-                if reporter.copy_missing_file(live_result.video_result):
-                    live_missing += 1
+                live_components.append(live_result.video_result)
+        live_missing = sum(await run.io_bound(reporter.copy_missing_files, live_components))
 
         log("")
         log("=" * 50)
@@ -663,11 +742,12 @@ async def export_missing_files(log_area):
     except Exception as e:
         log(f"ERROR: {e}")
         ui.notify(f"Error: {e}", type="negative")
-        import traceback
         log(traceback.format_exc())
 
     finally:
         app_state.is_exporting = False
+        if reporter:
+            reporter.close()
 
 
 def update_stats_display(container, stats: ProcessingStats):
@@ -709,13 +789,12 @@ def update_stats_display(container, stats: ProcessingStats):
                 ui.label(str(stats.live_photos_processed)).classes("text-h5")
 
 
-def update_results_display(container, results: list[ComparisonResult]):
-    """Update the results display with missing files."""
+def update_results_display(
+    container, missing: list[ComparisonResult], uncertain: list[ComparisonResult]
+):
+    """Update the results display with missing and uncertain files."""
     container.clear()
 
-    missing = [r for r in results if r.match_type == MatchResult.NO_MATCH]
-    uncertain = [r for r in results if r.match_type == MatchResult.UNCERTAIN]
-
     with container:
         if not missing and not uncertain:
             ui.label("No missing or uncertain files found!").classes(
@@ -723,38 +802,39 @@ def update_results_display(container, results: list[ComparisonResult]):
             )
             return
 
+        # Paginated tables only render the visible rows, so every result is
+        # listed without creating a widget per file
         if missing:
             ui.label(f"Missing Files ({len(missing)})").classes(
                 "text-weight-medium text-negative"
             )
-            with ui.scroll_area().classes("w-full h-48"):
-                for result in missing[:100]:  # Limit display
-                    with ui.row().classes("items-center gap-2"):
-                        ui.icon("warning", color="negative", size="sm")
-                        ui.label(str(result.amazon_asset.path.name)).classes(
-                            "text-sm"
-                        )
-
-            if len(missing) > 100:
-                ui.label(f"... and {len(missing) - 100} more").classes(
-                    "text-caption text-grey"
-                )
+            ui.table(
+                columns=[{"name": "name", "label": "File", "field": "name", "align": "left"}],
+                rows=[
+                    {"id": i, "name": result.amazon_asset.path.name}
+                    for i, result in enumerate(missing)
+                ],
+                row_key="id",
+                pagination=RESULTS_PAGE_SIZE,
+            ).props("dense flat").classes("w-full")
 
         if uncertain:
             ui.separator().classes("my-2")
             ui.label(f"Uncertain Matches ({len(uncertain)})").classes(
                 "text-weight-medium text-warning"
             )
-            with ui.scroll_area().classes("w-full h-32"):
-                for result in uncertain[:50]:
-                    with ui.row().classes("items-center gap-2"):
-                        ui.icon("help", color="warning", size="sm")
-                        ui.label(str(result.amazon_asset.path.name)).classes(
-                            "text-sm"
-                        )
-                        ui.label(f"({result.confidence:.0%})").classes(
-                            "text-caption text-grey"
-                        )
+            ui.table(
+                columns=[
+                    {"name": "name", "label": "File", "field": "name", "align": "left"},
+                    {"name": "confidence", "label": "Confidence", "field": "confidence"},
+                ],
+                rows=[
+                    {"id": i, "name": result.amazon_asset.path.name, "confidence": f"{result.confidence:.0%}"}
+                    for i, result in enumerate(uncertain)
+                ],
+                row_key="id",
+                pagination=RESULTS_PAGE_SIZE,
+            ).props("dense flat").classes("w-full")
 
 
 @ui.page("/")
@@ -800,6 +880,11 @@ def main_page():
             spinner = ui.spinner(size="lg")
             spinner.bind_visibility_from(app_state, "is_running")
 
+            # Live hashing progress; the binding is polled, so the hashing thread never touches the UI
+            progress_label = ui.label().classes("text-sm text-grey")
+            progress_label.bind_text_from(app_state, "progress_text")
+            progress_label.bind_visibility_from(app_state, "is_running")
+
             # Spinner for export state
             export_spinner = ui.spinner(size="lg", color="positive")
             export_spinner.bind_visibility_from(app_state, "is_exporting")
@@ -0,0 +1,63 @@
+"""Tests for the persistent SHA256/phash cache."""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from photo_restore.core.hash_cache import HashCache, file_key
+from photo_restore.core.parallel_hasher import ParallelHasher
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    cache = HashCache(tmp_path / "hashes.db")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def photo(tmp_path: Path) -> Path:
+    path = tmp_path / "IMG_0001.jpg"
+    path.write_bytes(b"original photo")
+    return path
+
+
+def test_unchanged_file_is_a_hit(cache: HashCache, photo: Path):
+    cache.put_many({photo: (file_key(photo), "cached-sha", 0x1234)})
+
+    assert cache.get_many({photo: file_key(photo)}) == {photo: ("cached-sha", 0x1234)}
+    # The hasher answers from the cache without reading the file
+    assert ParallelHasher(max_workers=1, cache=cache).compute_sha256_batch([photo]) == {photo: "cached-sha"}
+
+
+def test_changed_file_is_a_miss_and_rehashed(cache: HashCache, photo: Path):
+    cache.put_many({photo: (file_key(photo), "stale-sha", None)})
+    st = photo.stat()
+    photo.write_bytes(b"edited photo, now longer")
+    os.utime(photo, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get_many({photo: file_key(photo)}) == {}
+
+    expected = hashlib.sha256(b"edited photo, now longer").hexdigest()
+    assert ParallelHasher(max_workers=1, cache=cache).compute_sha256_batch([photo]) == {photo: expected}
+    assert cache.get_many({photo: file_key(photo)}) == {photo: (expected, None)}
+
+
+def test_sha256_only_update_keeps_phash_for_same_key(cache: HashCache, photo: Path):
+    key = file_key(photo)
+    cache.put_many({photo: (key, None, 0xABCD)})
+    cache.put_many({photo: (key, "new-sha", None)})
+
+    assert cache.get_many({photo: key}) == {photo: ("new-sha", 0xABCD)}
+
+
+def test_sha256_only_update_drops_phash_when_key_changed(cache: HashCache, photo: Path):
+    old_key = file_key(photo)
+    cache.put_many({photo: (old_key, "old-sha", 0xABCD)})
+    new_key = (old_key[0] + 1, old_key[1] + 1)
+    cache.put_many({photo: (new_key, "new-sha", None)})
+
+    assert cache.get_many({photo: new_key}) == {photo: ("new-sha", None)}
+    assert cache.get_many({photo: old_key}) == {}
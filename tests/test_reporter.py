@@ -0,0 +1,85 @@
+"""Tests for the Reporter's file staging and processing log."""
+
+import json
+from pathlib import Path
+
+from photo_restore.core import ComparisonResult, MatchResult, PhotoAsset
+from photo_restore.output import Reporter
+
+
+def test_unique_dest_skips_names_already_handed_out(tmp_path: Path):
+    reporter = Reporter(tmp_path / "out")
+    dest_folder = tmp_path / "out" / "missing"
+
+    dests = [
+        reporter._unique_dest(dest_folder, Path("a/IMG_0003.jpg")),
+        reporter._unique_dest(dest_folder, Path("b/IMG_0003_1.jpg")),
+        reporter._unique_dest(dest_folder, Path("c/IMG_0003.jpg")),
+    ]
+
+    assert [d.name for d in dests] == ["IMG_0003.jpg", "IMG_0003_1.jpg", "IMG_0003_2.jpg"]
+
+
+def test_unique_dest_skips_existing_files(tmp_path: Path):
+    dest_folder = tmp_path / "missing"
+    dest_folder.mkdir()
+    (dest_folder / "IMG_0003.jpg").touch()
+    reporter = Reporter(tmp_path)
+
+    assert reporter._unique_dest(dest_folder, Path("a/IMG_0003.jpg")).name == "IMG_0003_1.jpg"
+
+
+def _missing(path: Path) -> ComparisonResult:
+    return ComparisonResult(PhotoAsset(path, path.stat().st_size), MatchResult.NO_MATCH)
+
+
+def _colliding_sources(root: Path) -> list[Path]:
+    """Write IMG_0003.jpg, IMG_0003_1.jpg and a second IMG_0003.jpg in separate folders."""
+    sources = [root / "a" / "IMG_0003.jpg", root / "b" / "IMG_0003_1.jpg", root / "c" / "IMG_0003.jpg"]
+    for i, src in enumerate(sources):
+        src.parent.mkdir(parents=True)
+        src.write_bytes(f"photo {i}".encode())
+    return sources
+
+
+def test_process_results_stages_colliding_names_separately(tmp_path: Path):
+    sources = _colliding_sources(tmp_path / "amazon")
+    reporter = Reporter(tmp_path / "out")
+
+    reporter.process_results([_missing(src) for src in sources], [])
+    reporter.close()
+
+    staged = sorted((tmp_path / "out" / "missing").iterdir())
+    assert [p.name for p in staged] == ["IMG_0003.jpg", "IMG_0003_1.jpg", "IMG_0003_2.jpg"]
+    assert sorted(p.read_bytes() for p in staged) == sorted(src.read_bytes() for src in sources)
+
+
+def test_each_run_writes_its_own_processing_log(tmp_path: Path):
+    first = Reporter(tmp_path, dry_run=True)
+    report_path = first.generate_report([], [], tmp_path / "amazon")
+    first.close()
+
+    second = Reporter(tmp_path)
+    second.setup_output_folder()
+    second.close()
+
+    log_path = Path(json.loads(report_path.read_text())["processing_log"])
+    assert log_path != second.log_path
+    assert len(list(tmp_path.glob("processing_log_*.ndjson"))) == 2
+    messages = [json.loads(line)["message"] for line in log_path.read_text().splitlines()]
+    assert not any(m.startswith("Created output folder") for m in messages)
+
+
+def test_dry_run_creates_nothing_before_the_report(tmp_path: Path):
+    out = tmp_path / "out"
+    reporter = Reporter(out, dry_run=True)
+
+    reporter.setup_output_folder()
+    assert not out.exists()
+
+    report_path = reporter.generate_report([], [], tmp_path / "amazon")
+    reporter.close()
+
+    log_path = Path(json.loads(report_path.read_text())["processing_log"])
+    messages = [json.loads(line)["message"] for line in log_path.read_text().splitlines()]
+    assert messages[0] == f"[DRY RUN] Would create folder: {out}"
@@ -0,0 +1,101 @@
+"""Tests for the web UI's comparison and export handlers."""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from photo_restore import web
+from photo_restore.core import ComparisonResult, MatchResult, PhotoAsset
+
+
+class FakeLog:
+    """Stands in for ui.log outside a running page."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def push(self, line: str) -> None:
+        self.lines.append(line)
+
+    def clear(self) -> None:
+        self.lines.clear()
+
+
+@pytest.fixture
+def app_state(monkeypatch, tmp_path: Path):
+    state = web.PhotoRestoreApp()
+    state.output_folder = str(tmp_path / "out")
+    state.comparison_done = True
+    monkeypatch.setattr(web, "app_state", state)
+    monkeypatch.setattr(web.ui, "notify", lambda *args, **kwargs: None)
+    # Never open the user's real hash cache
+    monkeypatch.setattr(web, "open_hash_cache", lambda: None)
+    return state
+
+
+def test_export_stages_colliding_names_separately(app_state, tmp_path: Path):
+    sources = [
+        tmp_path / "amazon" / "a" / "IMG_0003.jpg",
+        tmp_path / "amazon" / "b" / "IMG_0003_1.jpg",
+        tmp_path / "amazon" / "c" / "IMG_0003.jpg",
+    ]
+    for i, src in enumerate(sources):
+        src.parent.mkdir(parents=True)
+        src.write_bytes(f"photo {i}".encode())
+    app_state.missing_results = [
+        ComparisonResult(PhotoAsset(src, src.stat().st_size), MatchResult.NO_MATCH) for src in sources
+    ]
+    app_state.results = list(app_state.missing_results)
+
+    asyncio.run(web.export_missing_files(FakeLog()))
+
+    staged = sorted((tmp_path / "out" / "missing").iterdir())
+    assert [p.name for p in staged] == ["IMG_0003.jpg", "IMG_0003_1.jpg", "IMG_0003_2.jpg"]
+    assert sorted(p.read_bytes() for p in staged) == sorted(src.read_bytes() for src in sources)
+
+
+def test_failed_amazon_load_waits_for_icloud_load(app_state, monkeypatch, tmp_path: Path):
+    for name in ("amazon", "icloud"):
+        (tmp_path / name).mkdir()
+    app_state.amazon_folder = str(tmp_path / "amazon")
+    app_state.icloud_folder = str(tmp_path / "icloud")
+    app_state.comparison_done = False
+    events: list[str] = []
+
+    def fail_load(self):
+        raise OSError("amazon folder unreadable")
+
+    def slow_load(self):
+        time.sleep(0.2)
+        events.append("icloud loaded")
+        return [], []
+
+    monkeypatch.setattr(web.AmazonReader, "load_all", fail_load)
+    monkeypatch.setattr(web.ICloudReader, "load_all", slow_load)
+    monkeypatch.setattr(web.ui, "notify", lambda message, **kwargs: events.append(message))
+    log_area = FakeLog()
+
+    asyncio.run(web.run_comparison(log_area, FakeLog(), FakeLog()))
+
+    # The failure is only reported once the iCloud load is no longer running
+    assert events == ["icloud loaded", "Error: amazon folder unreadable"]
+    assert any("ERROR: amazon folder unreadable" in line for line in log_area.lines)
+    assert not app_state.is_running
+
+
+def test_unreadable_folder_counts_are_not_cached(monkeypatch, tmp_path: Path):
+    (tmp_path / "IMG_0001.jpg").write_bytes(b"photo")
+    real_scandir = os.scandir
+
+    def denied(path):
+        raise PermissionError(13, "Operation not permitted", str(path))
+
+    monkeypatch.setattr(os, "scandir", denied)
+    assert web.count_media_files(str(tmp_path))["total"] == 0
+
+    # Same folder and mtime once access is granted
+    monkeypatch.setattr(os, "scandir", real_scandir)
+    assert web.count_media_files(str(tmp_path))["photos"] == 1